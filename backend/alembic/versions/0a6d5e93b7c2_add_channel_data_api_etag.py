@@ -0,0 +1,26 @@
+"""add_channel_data_api_etag
+
+Revision ID: 0a6d5e93b7c2
+Revises: f2b8d6a41c07
+Create Date: 2026-10-15 15:58:44.102635
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0a6d5e93b7c2'
+down_revision: Union[str, None] = 'f2b8d6a41c07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('channels', sa.Column('data_api_etag', sa.String(length=128), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('channels', 'data_api_etag')
@@ -0,0 +1,29 @@
+"""unique_channel_youtube_channel_id
+
+Revision ID: 1de1e1f6700b
+Revises: a207e77698e5
+Create Date: 2026-10-15 09:12:41.208117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1de1e1f6700b'
+down_revision: Union[str, None] = 'a207e77698e5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # ON CONFLICT (youtube_channel_id) upserts need a unique index on the column
+    op.drop_index('ix_channels_youtube_channel_id', table_name='channels')
+    op.create_index('ix_channels_youtube_channel_id', 'channels', ['youtube_channel_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_channels_youtube_channel_id', table_name='channels')
+    op.create_index('ix_channels_youtube_channel_id', 'channels', ['youtube_channel_id'], unique=False)
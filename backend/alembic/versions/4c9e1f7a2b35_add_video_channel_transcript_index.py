@@ -0,0 +1,34 @@
+"""add_video_channel_transcript_index
+
+Revision ID: 4c9e1f7a2b35
+Revises: 0a6d5e93b7c2
+Create Date: 2026-10-15 16:42:17.318904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c9e1f7a2b35'
+down_revision: Union[str, None] = '0a6d5e93b7c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY can't run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_videos_channel_id_transcript_s3_key',
+            'videos',
+            ['channel_id', 'transcript_s3_key'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_videos_channel_id_transcript_s3_key', table_name='videos', postgresql_concurrently=True)
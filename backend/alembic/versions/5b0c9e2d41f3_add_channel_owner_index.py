@@ -0,0 +1,34 @@
+"""add_channel_owner_index
+
+Revision ID: 5b0c9e2d41f3
+Revises: 1de1e1f6700b
+Create Date: 2026-10-15 09:40:03.551204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b0c9e2d41f3'
+down_revision: Union[str, None] = '1de1e1f6700b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY can't run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_channels_owner_id_id',
+            'channels',
+            ['owner_id', 'id'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_channels_owner_id_id', table_name='channels', postgresql_concurrently=True)
@@ -0,0 +1,35 @@
+"""add_video_channel_views_index
+
+Revision ID: 6e2d8b4f1a97
+Revises: 9b27d4e6c813
+Create Date: 2026-10-15 18:05:41.270113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e2d8b4f1a97'
+down_revision: Union[str, None] = '9b27d4e6c813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY can't run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_videos_channel_id_views',
+            'videos',
+            ['channel_id', sa.text('views DESC')],
+            postgresql_include=['likes', 'ctr'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_videos_channel_id_views', table_name='videos', postgresql_concurrently=True)
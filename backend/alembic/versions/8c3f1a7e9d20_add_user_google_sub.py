@@ -0,0 +1,28 @@
+"""add_user_google_sub
+
+Revision ID: 8c3f1a7e9d20
+Revises: 5b0c9e2d41f3
+Create Date: 2026-10-15 10:05:27.730914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c3f1a7e9d20'
+down_revision: Union[str, None] = '5b0c9e2d41f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('google_sub', sa.String(length=255), nullable=True))
+    op.create_index('ix_users_google_sub', 'users', ['google_sub'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_google_sub', table_name='users')
+    op.drop_column('users', 'google_sub')
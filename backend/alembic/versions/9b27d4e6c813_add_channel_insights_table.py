@@ -0,0 +1,34 @@
+"""add_channel_insights_table
+
+Revision ID: 9b27d4e6c813
+Revises: 4c9e1f7a2b35
+Create Date: 2026-10-15 17:26:08.540219
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b27d4e6c813'
+down_revision: Union[str, None] = '4c9e1f7a2b35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'channel_insights',
+        sa.Column('channel_id', sa.Integer(), nullable=False),
+        sa.Column('patterns_json', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('computed_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['channel_id'], ['channels.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('channel_id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('channel_insights')
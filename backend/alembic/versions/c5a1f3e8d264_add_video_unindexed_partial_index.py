@@ -0,0 +1,35 @@
+"""add_video_unindexed_partial_index
+
+Revision ID: c5a1f3e8d264
+Revises: 6e2d8b4f1a97
+Create Date: 2026-10-15 18:31:09.845227
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5a1f3e8d264'
+down_revision: Union[str, None] = '6e2d8b4f1a97'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY can't run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_videos_channel_id_unindexed',
+            'videos',
+            ['channel_id'],
+            postgresql_where=sa.text('transcript_s3_key IS NOT NULL AND indexed_at IS NULL'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_videos_channel_id_unindexed', table_name='videos', postgresql_concurrently=True)
@@ -0,0 +1,28 @@
+"""add_user_access_token_columns
+
+Revision ID: d41e7b0c2a96
+Revises: 8c3f1a7e9d20
+Create Date: 2026-10-15 10:31:52.104385
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41e7b0c2a96'
+down_revision: Union[str, None] = '8c3f1a7e9d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('google_access_token', sa.Text(), nullable=True))
+    op.add_column('users', sa.Column('google_token_expiry', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'google_token_expiry')
+    op.drop_column('users', 'google_access_token')
@@ -0,0 +1,29 @@
+"""unique_video_youtube_video_id
+
+Revision ID: e7a9c3f05b18
+Revises: d41e7b0c2a96
+Create Date: 2026-10-15 14:03:27.551902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a9c3f05b18'
+down_revision: Union[str, None] = 'd41e7b0c2a96'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # ON CONFLICT (youtube_video_id) upserts need a unique index on the column
+    op.drop_index('ix_videos_youtube_video_id', table_name='videos')
+    op.create_index('ix_videos_youtube_video_id', 'videos', ['youtube_video_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_videos_youtube_video_id', table_name='videos')
+    op.create_index('ix_videos_youtube_video_id', 'videos', ['youtube_video_id'], unique=False)
@@ -0,0 +1,26 @@
+"""add_channel_uploads_playlist_id
+
+Revision ID: f2b8d6a41c07
+Revises: e7a9c3f05b18
+Create Date: 2026-10-15 15:21:09.334718
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b8d6a41c07'
+down_revision: Union[str, None] = 'e7a9c3f05b18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('channels', sa.Column('uploads_playlist_id', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('channels', 'uploads_playlist_id')
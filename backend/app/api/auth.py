@@ -1,27 +1,22 @@
-import os
-from fastapi import APIRouter, Request, Response, HTTPException, Depends
+import asyncio
+from fastapi import APIRouter, BackgroundTasks, Request, Response, HTTPException, Depends
 from fastapi.responses import RedirectResponse, JSONResponse
 from google_auth_oauthlib.flow import Flow
 from urllib.parse import urlencode
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
 import jwt
-from sqlalchemy.orm import Session
-from app.db.session import get_db
+import httpx
+from datetime import datetime, timedelta
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.db.session import AsyncSessionLocal, get_async_db
 from app.models.models import User, Channel
-from datetime import datetime, date, timedelta # New import for date calculations
+from app.core.config import Settings, get_settings
+from app.core.security import SESSION_COOKIE_NAME, create_session_token
+from app.services import google_api, google_tokens
 
 router = APIRouter()
 
-GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID", "")
-GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET", "")
-
-# Change this to your deployed frontend URL in production
-FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:3000")
-# This must also be whitelisted in your Google Cloud OAuth "Authorized redirect URIs"
-REDIRECT_URI = os.getenv("GOOGLE_OAUTH_REDIRECT_URI") or "http://localhost:8000/api/auth/oauth/google/callback"
-
 SCOPES = [
     "https://www.googleapis.com/auth/youtube.readonly",
     "https://www.googleapis.com/auth/userinfo.email",
@@ -29,17 +24,113 @@ SCOPES = [
     "https://www.googleapis.com/auth/yt-analytics.readonly", # NEW SCOPE
 ]
 
-os.environ["OAUTHLIB_INSECURE_TRANSPORT"] = "1"  # Only for dev!
+# Client config is a process constant - build it once instead of per request
+_settings = get_settings()
+_CLIENT_CONFIG = {
+    "web": {
+        "client_id": _settings.google_client_id,
+        "client_secret": _settings.google_client_secret,
+        "auth_uri": "https://accounts.google.com/o/oauth2/auth",
+        "token_uri": google_api.TOKEN_URI,
+    }
+}
+
+
+def _new_flow() -> Flow:
+    """Create an OAuth flow from the cached client config"""
+    return Flow.from_client_config(
+        _CLIENT_CONFIG, scopes=SCOPES, redirect_uri=_settings.google_oauth_redirect_uri
+    )
 
-@router.get("/oauth/google/url")
-async def get_google_oauth_url(request: Request):
 
-    print(GOOGLE_CLIENT_ID, GOOGLE_CLIENT_SECRET)
-    flow = Flow.from_client_config(
-        {"web": {"client_id": GOOGLE_CLIENT_ID, "client_secret": GOOGLE_CLIENT_SECRET, "auth_uri": "https://accounts.google.com/o/oauth2/auth", "token_uri": "https://oauth2.googleapis.com/token"}},
-        scopes=SCOPES,
-        redirect_uri=REDIRECT_URI,
+async def sync_channel_data(user_id: int, access_token: str) -> None:
+    """
+    Fetch the user's YouTube channel and watch hours and upsert the channel.
+
+    Runs with its own DB session - inline on first login, otherwise as a
+    background task after the OAuth redirect.
+
+    Args:
+        user_id: Database user ID owning the channel
+        access_token: Fresh Google access token from the code exchange
+    """
+    # Use access token to get YouTube channel info (Data API)
+    total_views = 0
+    subscribers = 0
+    youtube_channel_id = None
+    channel_name = "Unknown Channel"
+    avatar_url = None
+    is_verified = False
+    uploads_playlist_id = None
+
+    # Data API and Analytics API are independent - fetch them concurrently.
+    # Analytics uses channel==MINE so it doesn't have to wait for the channel ID.
+    response_yt, watch_hours = await asyncio.gather(
+        google_api.fetch_channels(access_token, mine="true"),
+        google_api.fetch_watch_hours(access_token),
+        return_exceptions=True,
     )
+
+    if isinstance(response_yt, Exception):
+        print(f"Error fetching YouTube Data API channel info: {response_yt}")
+        # Don't raise here, still use Analytics API result if available
+    elif response_yt and response_yt.get("items"):
+        channel_data = response_yt["items"][0]
+        snippet = channel_data["snippet"]
+        stats = channel_data["statistics"]
+        youtube_channel_id = channel_data["id"]
+        channel_name = snippet["title"]
+        avatar_url = snippet["thumbnails"]["default"]["url"]
+        subscribers = int(stats.get("subscriberCount", 0))
+        is_verified = snippet.get("liveStreamingDetails", {}).get("isVerified", False)
+        total_views = int(stats.get("viewCount", 0))
+        uploads_playlist_id = channel_data.get("contentDetails", {}).get("relatedPlaylists", {}).get("uploads")
+    else:
+        print(f"No YouTube channel found via Data API for the authenticated user.")
+
+    # --- NEW: Fetch total watch hours using YouTube Analytics API ---
+    total_watch_hours = 0.0
+    if isinstance(watch_hours, Exception):
+        print(f"Error fetching YouTube Analytics API watch hours for channel {youtube_channel_id}: {watch_hours}")
+        # Do not raise, just use default 0.0 if analytics fails
+    elif watch_hours is not None:
+        total_watch_hours = watch_hours
+    else:
+        print(f"No watch hours data found for channel {youtube_channel_id} from Analytics API.")
+    # --- END NEW: Fetch total watch hours ---
+
+
+    # Upsert channel and update all fields
+    if youtube_channel_id:
+        channel_fields = {
+            "name": channel_name,
+            "avatar_url": avatar_url,
+            "subscribers": subscribers,
+            "verified": is_verified,
+            "total_views": total_views,
+            "total_watch_hours": total_watch_hours,
+            "uploads_playlist_id": uploads_playlist_id,
+        }
+        insert_stmt = pg_insert(Channel).values(
+            owner_id=user_id, youtube_channel_id=youtube_channel_id, **channel_fields
+        )
+        channel_stmt = insert_stmt.on_conflict_do_update(
+            index_elements=[Channel.youtube_channel_id],
+            set_=channel_fields,
+            # Leave the row (and WAL) untouched when the fetched values haven't changed
+            where=or_(*(
+                Channel.__table__.c[field].is_distinct_from(insert_stmt.excluded[field])
+                for field in channel_fields
+            )),
+        )
+        async with AsyncSessionLocal() as db:
+            await db.execute(channel_stmt)
+            await db.commit()
+
+
+@router.get("/oauth/google/url")
+async def get_google_oauth_url(request: Request):
+    flow = _new_flow()
     authorization_url, state = flow.authorization_url(
         access_type="offline",
         include_granted_scopes="true",
@@ -51,136 +142,83 @@ async def get_google_oauth_url(request: Request):
 
 @router.get("/oauth/google/callback")
 async def google_oauth_callback(
-    request: Request, response: Response, code: str, db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    code: str,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+    settings: Settings = Depends(get_settings),
 ):
     """
-    Handles Google OAuth redirect, exchanges code for token, fetches user/channel info, persists user/session.
+    Handles Google OAuth redirect, exchanges code for token, persists user/session and
+    syncs the channel (in the background for users who already have one).
     """
-    if not GOOGLE_CLIENT_ID or not GOOGLE_CLIENT_SECRET:
+    if not settings.google_client_id or not settings.google_client_secret:
         raise HTTPException(status_code=500, detail="Google OAuth credentials not configured.")
 
-    flow = Flow.from_client_config(
-        {"web": {"client_id": GOOGLE_CLIENT_ID, "client_secret": GOOGLE_CLIENT_SECRET, "auth_uri": "https://accounts.google.com/o/oauth2/auth", "token_uri": "https://oauth2.googleapis.com/token"}},
-        scopes=SCOPES,
-        redirect_uri=REDIRECT_URI,
-    )
     try:
-        flow.fetch_token(code=code)
+        token_response = await google_api.exchange_code(code, settings.google_oauth_redirect_uri)
     except Exception as e:
         return JSONResponse(status_code=400, content={"detail": f"Error fetching token: {e}"})
 
-    creds = flow.credentials
-    if not creds.id_token:
+    access_token = token_response.get("access_token")
+    id_token = token_response.get("id_token")
+    if not id_token:
         raise HTTPException(status_code=400, detail="No ID token received.")
 
-    # Decode ID token to get user's email
-    id_info = jwt.decode(creds.id_token, options={"verify_signature": False})
+    # Verify ID token against Google's signing keys and get the user's identity
+    try:
+        id_info = await google_api.verify_id_token(id_token)
+    except (jwt.InvalidTokenError, httpx.HTTPError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid ID token: {e}")
+    google_sub = id_info["sub"]
     user_email = id_info.get("email")
 
     if not user_email:
         raise HTTPException(status_code=400, detail="Could not retrieve user email from ID token.")
 
-    # Find or create user
-    user = db.query(User).filter(User.email == user_email).first()
-    if not user:
-        user = User(email=user_email)
-        db.add(user)
-        db.commit()
-        db.refresh(user)
-
-    # Store refresh token
-    user.google_refresh_token = creds.refresh_token
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-
-    # Use access token to get YouTube channel info (Data API)
-    total_views = 0
-    subscribers = 0
-    youtube_channel_id = None
-    channel_name = "Unknown Channel"
-    avatar_url = None
-    is_verified = False
-
-    try:
-        youtube = build("youtube", "v3", credentials=creds)
-        response_yt = youtube.channels().list(
-            mine=True,
-            part="snippet,statistics"
-        ).execute()
-
-        if response_yt and response_yt.get("items"):
-            channel_data = response_yt["items"][0]
-            youtube_channel_id = channel_data["id"]
-            channel_name = channel_data["snippet"]["title"]
-            avatar_url = channel_data["snippet"]["thumbnails"]["default"]["url"]
-            subscribers = int(channel_data["statistics"].get("subscriberCount", 0))
-            is_verified = channel_data["snippet"].get("liveStreamingDetails", {}).get("isVerified", False)
-            total_views = int(channel_data["statistics"].get("viewCount", 0))
-        else:
-            print(f"No YouTube channel found via Data API for the authenticated user.")
-
-    except Exception as e:
-        print(f"Error fetching YouTube Data API channel info: {e}")
-        # Don't raise here, try to proceed to Analytics API if basic data fetched
-
-    # --- NEW: Fetch total watch hours using YouTube Analytics API ---
-    total_watch_hours = 0.0
-    if youtube_channel_id: # Only proceed if we found a channel ID from Data API
-        try:
-            youtube_analytics = build("youtubeAnalytics", "v2", credentials=creds)
-            # Fetch all-time data
-            today = date.today().isoformat()
-            # An arbitrary early date for 'all time' if channel creation date isn't easily available
-            start_date = "2000-01-01" 
-
-            analytics_response = youtube_analytics.reports().query(
-                ids=f"channel=={youtube_channel_id}",
-                startDate=start_date,
-                endDate=today,
-                metrics="estimatedMinutesWatched"
-            ).execute()
-
-            if analytics_response and analytics_response.get("rows"):
-                estimated_minutes_watched = analytics_response["rows"][0][0]
-                total_watch_hours = float(estimated_minutes_watched) / 60.0
-            else:
-                print(f"No watch hours data found for channel {youtube_channel_id} from Analytics API.")
-
-        except Exception as e:
-            print(f"Error fetching YouTube Analytics API watch hours for channel {youtube_channel_id}: {e}")
-            # Do not raise, just use default 0.0 if analytics fails
-    # --- END NEW: Fetch total watch hours ---
-
-
-    # Find or create channel and update all fields
-    channel = db.query(Channel).filter(Channel.youtube_channel_id == youtube_channel_id).first()
-    if not channel:
-        channel = Channel(
-            owner_id=user.id,
-            youtube_channel_id=youtube_channel_id,
-            name=channel_name,
-            avatar_url=avatar_url,
-            subscribers=subscribers,
-            verified=is_verified,
-            total_views=total_views,
-            total_watch_hours=total_watch_hours
+    # Upsert user and store tokens in one round trip
+    token_fields = {
+        "google_sub": google_sub,
+        "google_refresh_token": token_response.get("refresh_token"),
+        "google_access_token": access_token,
+        "google_token_expiry": datetime.utcnow() + timedelta(seconds=int(token_response.get("expires_in", 3600))),
+    }
+    user_stmt = (
+        pg_insert(User)
+        .values(email=user_email, **token_fields)
+        .on_conflict_do_update(
+            index_elements=[User.email],
+            set_=token_fields,
         )
-        db.add(channel)
+        .returning(User.id)
+    )
+    user_id = (await db.execute(user_stmt)).scalar_one()
+    await db.commit()
+    await google_tokens.schedule_proactive_refresh(user_id, token_fields["google_token_expiry"])
+
+    # A returning user already has a channel row, so the re-sync doesn't gate the
+    # login. A first-time user needs it before the frontend asks for /channels/me.
+    has_channel = (await db.execute(
+        select(Channel.id).where(Channel.owner_id == user_id).limit(1)
+    )).scalar_one_or_none() is not None
+    if has_channel:
+        background_tasks.add_task(sync_channel_data, user_id, access_token)
     else:
-        # Update existing channel info
-        channel.name = channel_name
-        channel.avatar_url = avatar_url
-        channel.subscribers = subscribers
-        channel.verified = is_verified
-        channel.total_views = total_views
-        channel.total_watch_hours = total_watch_hours
-    db.commit()
-    db.refresh(channel)
+        await sync_channel_data(user_id, access_token)
 
     # Create a RedirectResponse explicitly
-    redirect_response = RedirectResponse(FRONTEND_URL)
+    redirect_response = RedirectResponse(settings.frontend_url)
     # Set the cookie directly on the redirect_response object
-    redirect_response.set_cookie(key="user_id", value=str(user.id), httponly=True, secure=False, samesite="Lax", domain="localhost")
+    session_token = create_session_token(user_id, user_email)
+    redirect_response.set_cookie(
+        key=SESSION_COOKIE_NAME,
+        value=session_token,
+        max_age=settings.session_ttl_seconds,
+        httponly=True,
+        secure=False,
+        samesite="Lax",
+        domain="localhost",
+    )
 
     return redirect_response
\ No newline at end of file
@@ -1,35 +1,96 @@
-import os
+import asyncio
 import logging
+from itertools import islice
 from fastapi import APIRouter, Depends, HTTPException, Response, Request
-from sqlalchemy.orm import Session
-from app.db.session import get_db
-from app.models.models import Channel, User
-from typing import List, Optional
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import literal_column, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager
+from app.db.session import get_async_db
+from app.db.redis_client import get_async_redis
+from app.db.request_cache import RequestCache, cached_get_async, get_request_cache
+from app.models.models import Channel, User, Video, VideoProcessingStatus
+from typing import Iterator, List, Optional, Tuple
+from pydantic import BaseModel, ConfigDict
 import jwt
+import orjson
+from redis.exceptions import RedisError
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
-from google.auth.transport.requests import Request as GoogleAuthRequest
-from datetime import date, timedelta # New import for date calculations
+from celery import group
 from app.core.logging_config import get_logger, LogExecutionTime
+from app.core.config import Settings, get_settings
+from app.core.security import SESSION_COOKIE_NAME, UserPrincipal, decode_session_token
+from app.services import google_api, google_tokens
+from app.services.pipeline_worker import queue_video_processing
+from app.services.youtube_client import YouTubeClient
 
 logger = get_logger(__name__)
 router = APIRouter()
 
 # --- New Dependency to get current user ---
-async def get_current_user(request: Request, db: Session = Depends(get_db)):
-    user_id = request.cookies.get("user_id")
-    if not user_id:
+async def get_current_user(request: Request) -> UserPrincipal:
+    """Resolve the authenticated user from the signed session cookie (no DB hit)"""
+    token = request.cookies.get(SESSION_COOKIE_NAME)
+    if not token:
         raise HTTPException(status_code=401, detail="Not authenticated")
-    
-    user = db.query(User).filter(User.id == int(user_id)).first()
+
+    try:
+        return decode_session_token(token)
+    except jwt.InvalidTokenError:
+        raise HTTPException(status_code=401, detail="Invalid or expired session")
+
+
+async def get_current_user_db(
+    principal: UserPrincipal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    cache: RequestCache = Depends(get_request_cache)
+) -> User:
+    """Load the full User row for endpoints that need mutable user fields"""
+    user = await cached_get_async(db, User, principal.id, cache)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
-# --- End New Dependency ---
 
-GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID", "")
-GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET", "")
+
+async def get_owned_channel(
+    channel_id: int,
+    principal: UserPrincipal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    cache: RequestCache = Depends(get_request_cache)
+) -> Channel:
+    """Load a channel together with its owner in one joined query, 404 unless the user owns it"""
+    channel = cache.get((Channel, channel_id))
+    if channel is None:
+        channel = (await db.scalars(
+            select(Channel)
+            .join(Channel.owner)
+            .options(contains_eager(Channel.owner))
+            .where(Channel.id == channel_id, Channel.owner_id == principal.id)
+        )).first()
+        if channel:
+            cache[(Channel, channel_id)] = channel
+            cache[(User, principal.id)] = channel.owner
+
+    if not channel or channel.owner_id != principal.id:
+        logger.warning(f"Channel {channel_id} not found or doesn't belong to user {principal.id}")
+        raise HTTPException(status_code=404, detail="Channel not found or does not belong to user.")
+    return channel
+
+
+async def get_video_owned_by(db: AsyncSession, video_id: int, user_id: int) -> Video:
+    """Load a video together with its channel in one joined query, 404 unless the user owns it"""
+    video = (await db.scalars(
+        select(Video)
+        .join(Channel, Channel.id == Video.channel_id)
+        .options(contains_eager(Video.channel))
+        .where(Video.id == video_id, Channel.owner_id == user_id)
+    )).first()
+    if not video:
+        logger.warning(f"Video {video_id} not found or doesn't belong to user {user_id}")
+        raise HTTPException(status_code=404, detail="Video not found or not authorized")
+    return video
+# --- End New Dependency ---
 
 
 class ChannelBase(BaseModel):
@@ -42,8 +103,7 @@ class ChannelBase(BaseModel):
     total_views: int
     total_watch_hours: float
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
 
 
 @router.post("/connect")
@@ -56,167 +116,366 @@ async def connect_channel(response: Response):
 
 @router.get("/me", response_model=ChannelBase)
 async def get_my_channel(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
     """
     Get information about the authenticated user's YouTube channel.
     """
-    ch = db.query(Channel).filter(Channel.owner_id == current_user.id).first()
-    if not ch:
+    # Select only the response columns - skips ORM hydration and identity-map work
+    row = (await db.execute(
+        select(
+            Channel.id,
+            Channel.youtube_channel_id,
+            Channel.name,
+            Channel.avatar_url,
+            Channel.subscribers,
+            Channel.verified,
+            Channel.total_views,
+            Channel.total_watch_hours,
+        ).where(Channel.owner_id == current_user.id)
+    )).first()
+    if not row:
         raise HTTPException(status_code=404, detail="No channel found for this user.")
-    return ch
+    # Columns are already JSON-native - return them directly rather than re-validating
+    # through response_model and jsonable_encoder
+    return ORJSONResponse(dict(row._mapping))
 
-# --- UPDATED ENDPOINT TO REFRESH CHANNEL DATA ---
-@router.post("/{channel_id}/refresh", response_model=ChannelBase)
-async def refresh_channel_data(
-    channel_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
+def _apply_channel_refresh(channel: Channel, channel_data_yt, watch_hours) -> bool:
     """
-    Refreshes the data for a specific channel from the YouTube Data API and Analytics API.
+    Copy fetched YouTube data onto a channel (caller commits).
+
+    Args:
+        channel: Channel to update
+        channel_data_yt: channels.list item, None if not found, google_api.NOT_MODIFIED
+            if unchanged since the stored ETag, or the fetch exception
+        watch_hours: Total watch hours, None if no rows, or the fetch exception
+
+    Returns:
+        True if any field changed
     """
-    # 1. Verify channel belongs to current user
-    channel = db.query(Channel).filter(
-        Channel.id == channel_id,
-        Channel.owner_id == current_user.id
-    ).first()
+    # Latest data from YouTube Data API
+    total_views = 0
+    subscribers = 0
+    channel_name = channel.name
+    avatar_url = channel.avatar_url
+    is_verified = channel.verified
 
-    if not channel:
-        raise HTTPException(status_code=404, detail="Channel not found or does not belong to user.")
-    
-    # 2. Get user's refresh token
-    if not current_user.google_refresh_token:
+    if channel_data_yt is google_api.NOT_MODIFIED:
+        # 304 - snippet/statistics unchanged since the last refresh
+        subscribers = channel.subscribers
+        total_views = channel.total_views
+    elif isinstance(channel_data_yt, Exception):
+        print(f"Error fetching YouTube Data API channel info for {channel.name}: {channel_data_yt}")
+        # Keep the existing stats - zeroing them here would stick, since the
+        # stored ETag still matches and later refreshes get a 304
+        subscribers = channel.subscribers or 0
+        total_views = channel.total_views or 0
+    elif channel_data_yt:
+        snippet = channel_data_yt["snippet"]
+        stats = channel_data_yt["statistics"]
+        channel_name = snippet["title"]
+        avatar_url = snippet["thumbnails"]["default"]["url"]
+        subscribers = int(stats.get("subscriberCount", 0))
+        # Note: YouTube API doesn't provide a direct verification status field
+        # Keep existing verification status or default to False
+        is_verified = channel.verified  # Maintain existing verification status
+        total_views = int(stats.get("viewCount", 0))
+    else:
+        print(f"No Data API channel info found for {channel.youtube_channel_id}.")
+
+    # --- NEW: Total watch hours from YouTube Analytics API ---
+    total_watch_hours = channel.total_watch_hours  # Default to existing value
+    if isinstance(watch_hours, Exception):
+        print(f"Error fetching YouTube Analytics API watch hours for channel {channel.name}: {watch_hours}")
+        print(f"Note: Analytics data may be unavailable or delayed. Using existing value: {total_watch_hours}")
+        # Do not raise, keep existing value if analytics fails
+    elif watch_hours is not None:
+        total_watch_hours = watch_hours
+    else:
+        print(
+            "Warning: No watch hours data returned from Analytics API. Data may be delayed by 24-48 hours. "
+            f"Channel: {channel.youtube_channel_id}"
+        )
+
+    new_fields = {
+        "name": channel_name,
+        "avatar_url": avatar_url,
+        "subscribers": subscribers,
+        "verified": is_verified,
+        "total_views": total_views,
+        "total_watch_hours": total_watch_hours,
+    }
+    # Stats rarely change between refreshes - skip the UPDATE when nothing did
+    if all(getattr(channel, field) == value for field, value in new_fields.items()):
+        return False
+
+    # Update existing channel object with all fetched data
+    for field, value in new_fields.items():
+        setattr(channel, field, value)
+    return True
+
+
+async def _get_access_token_or_401(db: AsyncSession, user: User) -> str:
+    """Get the user's Google access token, dropping the refresh token if Google rejects it"""
+    if not user.google_refresh_token:
         raise HTTPException(status_code=400, detail="User has no Google refresh token. Reconnect YouTube.")
 
-    # 3. Use refresh token to get new access token
-    creds = Credentials(
-        token=None,
-        refresh_token=current_user.google_refresh_token,
-        token_uri="https://oauth2.googleapis.com/token",
-        client_id=GOOGLE_CLIENT_ID,
-        client_secret=GOOGLE_CLIENT_SECRET,
-        scopes=["https://www.googleapis.com/auth/youtube.readonly", "https://www.googleapis.com/auth/userinfo.email", "openid", "https://www.googleapis.com/auth/yt-analytics.readonly"],
-    )
-    
     try:
-        creds.refresh(GoogleAuthRequest())
+        return await google_tokens.get_access_token(db, user)
     except Exception as e:
-        current_user.google_refresh_token = None
-        db.add(current_user)
-        db.commit()
+        user.google_refresh_token = None
+        db.add(user)
+        await db.commit()
         raise HTTPException(status_code=401, detail=f"Failed to refresh Google credentials: {e}. Please reconnect YouTube.")
 
-    if creds.refresh_token and creds.refresh_token != current_user.google_refresh_token:
-        current_user.google_refresh_token = creds.refresh_token
-        db.add(current_user)
-        db.commit()
 
-    # 4. Fetch latest data from YouTube Data API
-    total_views = 0
-    subscribers = 0
-    channel_name = channel.name
-    avatar_url = channel.avatar_url
-    is_verified = channel.verified
+def _chunked(values: List[str], size: int) -> Iterator[List[str]]:
+    """Yield successive lists of at most `size` values"""
+    iterator = iter(values)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+async def _refresh_channels(db: AsyncSession, user: User, channels: List[Channel]) -> bool:
+    """
+    Refresh channels owned by one user from the YouTube Data and Analytics APIs.
+
+    Snippets/statistics are fetched with one channels.list call per 50 IDs;
+    Analytics only takes one channel per query, so those calls run
+    concurrently alongside.
+
+    Args:
+        db: Database session
+        user: Owner of the channels (supplies the Google credentials)
+        channels: Channels to refresh
 
+    Returns:
+        True if any channel changed (caller commits)
+    """
+    access_token = await _get_access_token_or_401(db, user)
+
+    youtube_ids = [channel.youtube_channel_id for channel in channels]
+    chunks = list(_chunked(youtube_ids, google_api.CHANNELS_LIST_MAX_IDS))
+    # A stored ETag describes a single-channel response, so only one-channel
+    # requests can be made conditional
+    etags = {channel.youtube_channel_id: channel.data_api_etag for channel in channels}
+    results = await asyncio.gather(
+        *(
+            google_api.fetch_channels(
+                access_token,
+                etag=etags[chunk[0]] if len(chunk) == 1 else None,
+                id=",".join(chunk),
+                maxResults=len(chunk),
+            )
+            for chunk in chunks
+        ),
+        *(google_api.fetch_watch_hours(access_token, youtube_id) for youtube_id in youtube_ids),
+        return_exceptions=True,
+    )
+    list_responses, watch_hours = results[:len(chunks)], results[len(chunks):]
+
+    # Zip channels.list items back to their channels by YouTube ID
+    channel_data_by_id = {}
+    new_etags = {}
+    for chunk, response_yt in zip(chunks, list_responses):
+        if isinstance(response_yt, Exception) or response_yt is google_api.NOT_MODIFIED:
+            channel_data_by_id.update(dict.fromkeys(chunk, response_yt))
+            continue
+        channel_data_by_id.update(dict.fromkeys(chunk))
+        for item in response_yt.get("items", []):
+            channel_data_by_id[item["id"]] = item
+        if len(chunk) == 1:
+            new_etags[chunk[0]] = response_yt.get("etag")
+
+    changed = [
+        _apply_channel_refresh(channel, channel_data_by_id[channel.youtube_channel_id], channel_watch_hours)
+        for channel, channel_watch_hours in zip(channels, watch_hours)
+    ]
+    for channel in channels:
+        etag = new_etags.get(channel.youtube_channel_id)
+        if etag and etag != channel.data_api_etag:
+            channel.data_api_etag = etag
+            changed.append(True)
+    return any(changed)
+
+
+class BulkRefreshRequest(BaseModel):
+    channel_ids: List[int]
+
+
+@router.post("/refresh_bulk", response_model=List[ChannelBase])
+async def refresh_channels_bulk(
+    body: BulkRefreshRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_db)
+):
+    """
+    Refreshes several of the user's channels at once.
+    """
+    channels = (await db.scalars(
+        select(Channel).where(Channel.id.in_(body.channel_ids), Channel.owner_id == current_user.id)
+    )).all()
+    if not channels:
+        return []
+
+    if await _refresh_channels(db, current_user, channels):
+        await db.commit()
+
+    # Drop the single-channel refresh results these stats just superseded
     try:
-        youtube = build("youtube", "v3", credentials=creds)
-        response_yt = youtube.channels().list(
-            id=channel.youtube_channel_id,
-            part="snippet,statistics"
-        ).execute()
-
-        if response_yt and response_yt.get("items"):
-            channel_data_yt = response_yt["items"][0]
-            channel_name = channel_data_yt["snippet"]["title"]
-            avatar_url = channel_data_yt["snippet"]["thumbnails"]["default"]["url"]
-            subscribers = int(channel_data_yt["statistics"].get("subscriberCount", 0))
-            # Note: YouTube API doesn't provide a direct verification status field
-            # Keep existing verification status or default to False
-            is_verified = channel.verified  # Maintain existing verification status
-            total_views = int(channel_data_yt["statistics"].get("viewCount", 0))
-        else:
-            print(f"No Data API channel info found for {channel.youtube_channel_id}.")
+        await get_async_redis().delete(*(refresh_cache_key(channel.id) for channel in channels))
+    except RedisError as e:
+        logger.warning(f"Could not clear refresh cache after bulk refresh: {e}")
+    return channels
 
-    except Exception as e:
-        print(f"Error fetching YouTube Data API channel info for {channel.name}: {e}")
-        # Proceed with existing data or defaults if Data API fails
 
+# --- UPDATED ENDPOINT TO REFRESH CHANNEL DATA ---
+REFRESH_DEBOUNCE_SECONDS = 300
 
-    # --- NEW: Fetch total watch hours using YouTube Analytics API ---
-    total_watch_hours = channel.total_watch_hours  # Default to existing value
-    analytics_error = None
+
+def refresh_cache_key(channel_id: int) -> str:
+    """Redis key holding a channel's last /refresh response"""
+    return f"chrefresh:{channel_id}"
+
+
+@router.post("/{channel_id}/refresh", response_model=ChannelBase)
+async def refresh_channel_data(
+    channel: Channel = Depends(get_owned_channel),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Refreshes the data for a specific channel from the YouTube Data API and Analytics API.
+    """
+    # Repeated refreshes within REFRESH_DEBOUNCE_SECONDS get the last result -
+    # YouTube stats barely move that fast and Analytics lags by a day or more
+    cache_key = refresh_cache_key(channel.id)
+    redis_client = get_async_redis()
     try:
-        youtube_analytics = build("youtubeAnalytics", "v2", credentials=creds)
-        today = date.today().isoformat()
-        start_date = "2000-01-01" # Arbitrary early date for all time
-
-        analytics_response = youtube_analytics.reports().query(
-            ids=f"channel=={channel.youtube_channel_id}",
-            startDate=start_date,
-            endDate=today,
-            metrics="estimatedMinutesWatched"
-        ).execute()
-
-        if analytics_response and analytics_response.get("rows"):
-            estimated_minutes_watched = analytics_response["rows"][0][0]
-            total_watch_hours = float(estimated_minutes_watched) / 60.0
-        else:
-            analytics_error = "No watch hours data returned from Analytics API. Data may be delayed by 24-48 hours."
-            print(f"Warning: {analytics_error} Channel: {channel.youtube_channel_id}")
+        cached = await redis_client.get(cache_key)
+    except RedisError as e:
+        logger.warning(f"Refresh cache unavailable: {e}")
+        cached = None
+    if cached:
+        return Response(content=cached, media_type="application/json")
+
+    current_user = channel.owner
+
+    # Same path as the bulk refresh, with a single channel
+    if await _refresh_channels(db, current_user, [channel]):
+        db.add(channel)
+        # expire_on_commit=False keeps the values just written - no re-SELECT needed
+        await db.commit()
+
+    body = orjson.dumps(ChannelBase.model_validate(channel).model_dump(mode="json"))
+    try:
+        await redis_client.setex(cache_key, REFRESH_DEBOUNCE_SECONDS, body)
+    except RedisError as e:
+        logger.warning(f"Could not cache refresh result for channel {channel.id}: {e}")
+    return Response(content=body, media_type="application/json")
 
+
+# --- SYNC VIDEOS ENDPOINT ---
+# Video columns refreshed from YouTube on every sync
+VIDEO_SYNC_FIELDS = ("title", "thumbnail_url", "duration_seconds", "published_at", "views", "likes")
+
+
+async def _store_video_page(db: AsyncSession, channel: Channel, videos_data: List[dict]) -> Tuple[int, int, int]:
+    """
+    Upsert one page of fetched videos and queue the ones needing processing.
+
+    Args:
+        db: Database session
+        channel: Channel the videos belong to
+        videos_data: Videos from YouTubeClient.iter_video_pages
+
+    Returns:
+        (new videos, updated videos, videos queued for processing)
+    """
+    logger.info(f"Processing {len(videos_data)} videos for database storage")
+
+    new_videos_count = 0
+    updated_videos_count = 0
+    to_queue = []
+
+    # Insert new and update existing videos in one INSERT ... ON CONFLICT statement
+    insert_stmt = pg_insert(Video).values([
+        {
+            "channel_id": channel.id,
+            "youtube_video_id": video_data["video_id"],
+            **{field: video_data[field] for field in VIDEO_SYNC_FIELDS},
+        }
+        for video_data in videos_data
+    ])
+    upsert_stmt = insert_stmt.on_conflict_do_update(
+        index_elements=[Video.youtube_video_id],
+        set_={field: insert_stmt.excluded[field] for field in VIDEO_SYNC_FIELDS},
+    ).returning(
+        Video.id,
+        Video.youtube_video_id,
+        Video.processing_status,
+        # xmax is 0 only for rows this statement inserted
+        literal_column("xmax = 0").label("inserted"),
+    )
+
+    try:
+        rows = (await db.execute(upsert_stmt)).all()
+        logger.debug("Committing database transaction")
+        await db.commit()
     except Exception as e:
-        analytics_error = str(e)
-        print(f"Error fetching YouTube Analytics API watch hours for channel {channel.name}: {e}")
-        print(f"Note: Analytics data may be unavailable or delayed. Using existing value: {total_watch_hours}")
-        # Do not raise, keep existing value if analytics fails
+        logger.error(f"Database commit failed: {e}", exc_info=True)
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=f"Failed to save videos: {e}")
 
-    # Update existing channel object with all fetched data
-    channel.name = channel_name
-    channel.avatar_url = avatar_url
-    channel.subscribers = subscribers
-    channel.verified = is_verified
-    channel.total_views = total_views
-    channel.total_watch_hours = total_watch_hours
-
-    db.add(channel)
-    db.commit()
-    db.refresh(channel)
-    return channel
+    # Per-video logs use lazy %-args so filtered records cost no string building
+    total = len(rows)
+    for idx, row in enumerate(rows, 1):
+        if row.inserted:
+            logger.info("[%d/%d] Created new video: %s", idx, total, row.youtube_video_id)
+            new_videos_count += 1
+            to_queue.append(row)
+        else:
+            logger.debug("[%d/%d] Updated existing video: %s", idx, total, row.youtube_video_id)
+            updated_videos_count += 1
+            # Queue for processing if not yet processed or failed
+            if row.processing_status in [VideoProcessingStatus.SYNCED, VideoProcessingStatus.ERROR]:
+                to_queue.append(row)
+
+    # Queue only after commit so workers can see the rows - one group publish
+    # reuses a single broker connection instead of a .delay() round trip per video
+    queued_for_processing = 0
+    if to_queue:
+        try:
+            logger.debug(f"Queueing {len(to_queue)} videos for processing")
+            # Publishing to the broker is blocking - keep it off the event loop
+            await asyncio.to_thread(
+                group(queue_video_processing.s(row.id, row.youtube_video_id) for row in to_queue).apply_async
+            )
+            queued_for_processing = len(to_queue)
+            logger.info(f"Successfully queued {queued_for_processing} videos for processing")
+        except Exception as e:
+            logger.warning(f"Failed to queue {len(to_queue)} videos for processing: {e}", exc_info=True)
+
+    return new_videos_count, updated_videos_count, queued_for_processing
 
 
-# --- SYNC VIDEOS ENDPOINT ---
 @router.post("/{channel_id}/sync-videos")
 async def sync_channel_videos(
-    channel_id: int,
     limit: int = 50,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    channel: Channel = Depends(get_owned_channel),
+    db: AsyncSession = Depends(get_async_db),
+    settings: Settings = Depends(get_settings)
 ):
     """
     Sync videos from YouTube for the specified channel.
     Fetches latest videos and stores them in the database.
     """
-    from app.services.youtube_client import YouTubeClient
-    from app.models.models import Video
-
+    current_user = channel.owner
+    channel_id = channel.id
     logger.info(
         f"Sync videos request - channel_id={channel_id}, user_id={current_user.id}, limit={limit}"
     )
 
-    # Verify channel belongs to current user
-    channel = db.query(Channel).filter(
-        Channel.id == channel_id,
-        Channel.owner_id == current_user.id
-    ).first()
-
-    if not channel:
-        logger.warning(
-            f"Sync failed: Channel {channel_id} not found or doesn't belong to user {current_user.id}"
-        )
-        raise HTTPException(status_code=404, detail="Channel not found or does not belong to user.")
-
     logger.info(f"Syncing channel: {channel.name} (youtube_id={channel.youtube_channel_id})")
 
     # Get user's refresh token
@@ -224,131 +483,92 @@ async def sync_channel_videos(
         logger.error(f"User {current_user.id} has no Google refresh token")
         raise HTTPException(status_code=400, detail="User has no Google refresh token. Reconnect YouTube.")
 
-    # Refresh credentials
-    logger.debug("Refreshing Google OAuth credentials")
-    creds = Credentials(
-        token=None,
-        refresh_token=current_user.google_refresh_token,
-        token_uri="https://oauth2.googleapis.com/token",
-        client_id=GOOGLE_CLIENT_ID,
-        client_secret=GOOGLE_CLIENT_SECRET,
-        scopes=["https://www.googleapis.com/auth/youtube.readonly"],
-    )
-
+    # Get access token (refreshed only if the stored one is about to expire)
     try:
-        creds.refresh(GoogleAuthRequest())
-        logger.debug("Google OAuth credentials refreshed successfully")
+        access_token = await google_tokens.get_access_token(db, current_user)
     except Exception as e:
         logger.error(f"Failed to refresh credentials for user {current_user.id}: {e}", exc_info=True)
         raise HTTPException(status_code=401, detail=f"Failed to refresh credentials: {e}")
 
-    # Fetch videos from YouTube
+    creds = Credentials(
+        token=access_token,
+        refresh_token=current_user.google_refresh_token,
+        token_uri=google_api.TOKEN_URI,
+        client_id=settings.google_client_id,
+        client_secret=settings.google_client_secret,
+        scopes=["https://www.googleapis.com/auth/youtube.readonly"],
+        expiry=current_user.google_token_expiry,
+    )
+
+    # Fetch videos from YouTube page by page, storing each page while the next one is fetched
     youtube_client = YouTubeClient(credentials=creds)
 
-    try:
-        logger.info(f"Fetching {limit} videos from YouTube for channel {channel.youtube_channel_id}")
-        with LogExecutionTime(logger, f"Fetch videos from YouTube", logging.INFO):
-            videos_data = youtube_client.fetch_last_videos(
-                channel_id=channel.youtube_channel_id,
-                limit=limit,
-                order="date"
+    # Newest uploads come from the uploads playlist (1 quota unit/page vs 100 for search);
+    # channels connected before its ID was stored look it up once here
+    if not channel.uploads_playlist_id:
+        try:
+            channel.uploads_playlist_id = await asyncio.to_thread(
+                youtube_client.get_uploads_playlist_id, channel.youtube_channel_id
             )
-        logger.info(f"Successfully fetched {len(videos_data)} videos from YouTube")
-    except Exception as e:
-        logger.error(
-            f"Failed to fetch videos from YouTube for channel {channel_id}: {e}",
-            exc_info=True
-        )
-        raise HTTPException(status_code=500, detail=f"Failed to fetch videos from YouTube: {e}")
-
-    # Store videos in database and queue processing
-    from app.services.pipeline_worker import queue_video_processing
-
-    logger.info(f"Processing {len(videos_data)} videos for database storage")
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            logger.warning(f"Could not look up uploads playlist for channel {channel_id}: {e}")
+
+    pages = youtube_client.iter_video_pages(
+        channel.youtube_channel_id,
+        limit=limit,
+        order="date",
+        uploads_playlist_id=channel.uploads_playlist_id,
+    )
 
     new_videos_count = 0
     updated_videos_count = 0
     queued_for_processing = 0
+    total_fetched = 0
 
-    for idx, video_data in enumerate(videos_data, 1):
-        video_id = video_data["video_id"]
-        video_title = video_data["title"]
-
-        # Check if video already exists
-        existing_video = db.query(Video).filter(
-            Video.youtube_video_id == video_id
-        ).first()
-
-        if existing_video:
-            # Update existing video
-            logger.debug(f"[{idx}/{len(videos_data)}] Updating existing video: {video_id} - {video_title[:50]}")
-            existing_video.title = video_data["title"]
-            existing_video.thumbnail_url = video_data["thumbnail_url"]
-            existing_video.duration_seconds = video_data["duration_seconds"]
-            existing_video.published_at = video_data["published_at"]
-            existing_video.views = video_data["views"]
-            existing_video.likes = video_data["likes"]
-            updated_videos_count += 1
-
-            # Queue for processing if not yet processed or failed
-            from app.models.models import VideoProcessingStatus
-            if existing_video.processing_status in [VideoProcessingStatus.SYNCED, VideoProcessingStatus.ERROR]:
+    logger.info(f"Fetching {limit} videos from YouTube for channel {channel.youtube_channel_id}")
+    with LogExecutionTime(logger, f"Fetch and store videos from YouTube", logging.INFO):
+        next_page = asyncio.ensure_future(asyncio.to_thread(next, pages, None))
+        try:
+            while True:
                 try:
-                    logger.debug(f"Queueing existing video {existing_video.id} for processing (status: {existing_video.processing_status})")
-                    queue_video_processing.delay(existing_video.id, existing_video.youtube_video_id)
-                    queued_for_processing += 1
-                    logger.info(f"Successfully queued existing video {existing_video.id} ({video_id}) for processing")
+                    # Shielded: cancelling the request must not orphan the fetch thread
+                    videos_data = await asyncio.shield(next_page)
                 except Exception as e:
-                    logger.warning(
-                        f"Failed to queue existing video {existing_video.id} ({video_id}) for processing: {e}",
+                    logger.error(
+                        f"Failed to fetch videos from YouTube for channel {channel_id}: {e}",
                         exc_info=True
                     )
-        else:
-            # Create new video
-            logger.info(f"[{idx}/{len(videos_data)}] Creating new video: {video_id} - {video_title[:50]}")
-            new_video = Video(
-                channel_id=channel.id,
-                youtube_video_id=video_id,
-                title=video_data["title"],
-                thumbnail_url=video_data["thumbnail_url"],
-                duration_seconds=video_data["duration_seconds"],
-                published_at=video_data["published_at"],
-                views=video_data["views"],
-                likes=video_data["likes"],
-            )
-            db.add(new_video)
-            db.flush()  # Get the video ID without committing
-
-            # Queue for processing
-            try:
-                logger.debug(f"Queueing video {new_video.id} for processing")
-                queue_video_processing.delay(new_video.id, new_video.youtube_video_id)
-                queued_for_processing += 1
-                logger.info(f"Successfully queued video {new_video.id} ({video_id}) for processing")
-            except Exception as e:
-                logger.warning(
-                    f"Failed to queue video {new_video.id} ({video_id}) for processing: {e}",
-                    exc_info=True
-                )
-
-            new_videos_count += 1
+                    raise HTTPException(status_code=500, detail=f"Failed to fetch videos from YouTube: {e}")
+                if videos_data is None:
+                    break
+
+                next_page = asyncio.ensure_future(asyncio.to_thread(next, pages, None))
+                if not videos_data:
+                    continue
+                total_fetched += len(videos_data)
+                new_count, updated_count, queued_count = await _store_video_page(db, channel, videos_data)
+                new_videos_count += new_count
+                updated_videos_count += updated_count
+                queued_for_processing += queued_count
+        finally:
+            # Cancelling a to_thread future doesn't stop its thread - let the
+            # in-flight fetch finish before closing the generator it is advancing
+            await asyncio.wait([next_page])
+            if not next_page.cancelled():
+                next_page.exception()  # Mark retrieved - the loop reported any failure it saw
+            pages.close()
 
-    try:
-        logger.debug("Committing database transaction")
-        db.commit()
-        logger.info(
-            f"Sync complete - new: {new_videos_count}, updated: {updated_videos_count}, "
-            f"queued: {queued_for_processing} (user_id={current_user.id}, channel_id={channel_id})"
-        )
-    except Exception as e:
-        logger.error(f"Database commit failed: {e}", exc_info=True)
-        db.rollback()
-        raise HTTPException(status_code=500, detail=f"Failed to save videos: {e}")
+    logger.info(
+        f"Sync complete - new: {new_videos_count}, updated: {updated_videos_count}, "
+        f"queued: {queued_for_processing} (user_id={current_user.id}, channel_id={channel_id})"
+    )
 
     return {
         "success": True,
         "new_videos": new_videos_count,
         "updated_videos": updated_videos_count,
-        "total_fetched": len(videos_data),
+        "total_fetched": total_fetched,
         "queued_for_processing": queued_for_processing
     }
\ No newline at end of file
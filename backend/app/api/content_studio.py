@@ -1,24 +1,72 @@
 """
 Content Studio API endpoints - AI-powered content creation features.
 """
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+import asyncio
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from typing import Optional, List
-from app.db.session import get_db
-from app.models.models import User, Channel, Video
-from app.api.channels import get_current_user
-from app.services.pattern_analyzer import get_pattern_analyzer
+from app.db.session import get_async_db, run_with_session
+from app.db.redis_client import get_async_redis
+from app.models.models import Channel, ChannelInsight, Video
+from app.api.channels import get_current_user, get_video_owned_by
+from app.api.tasks import queue_user_task
+from app.core.security import UserPrincipal
+from app.services.pattern_analyzer import (
+    PATTERNS_CACHE_TTL_SECONDS,
+    get_pattern_analyzer,
+    patterns_cache_key,
+)
 from app.services.title_optimizer import get_title_optimizer
 from app.services.generation_worker import generate_script_with_rag
-from app.services.vector_store import get_vector_store
+from app.services.insights_worker import INSIGHTS_MAX_AGE, queue_insights_refresh_async, store_channel_insights
+from app.services.vector_store import VECTOR_STATS_CACHE_KEY, get_vector_store
 from app.services.storage_client import get_storage_client
-import json
+import orjson
+from redis.exceptions import RedisError
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
 
 
 router = APIRouter()
 
 
+async def _cached_json(key: str, compute, ttl: int):
+    """
+    Return the JSON value cached at `key`, or run `compute` in a thread and cache it.
+
+    Redis being unavailable only costs the cache - the value is still computed.
+    """
+    redis_client = get_async_redis()
+    try:
+        cached = await redis_client.get(key)
+    except RedisError as e:
+        logger.warning(f"Insights cache unavailable: {e}")
+        cached = None
+    if cached:
+        return orjson.loads(cached)
+
+    value = await asyncio.to_thread(compute)
+    try:
+        await redis_client.set(key, orjson.dumps(value), ex=ttl)
+    except RedisError as e:
+        logger.warning(f"Could not cache {key}: {e}")
+    return value
+
+
+async def _channel_patterns(channel_id: int, top_n: int) -> dict:
+    """Pattern analysis for a channel (sync queries + LLM call), cached in Redis"""
+    pattern_analyzer = get_pattern_analyzer()
+    return await _cached_json(
+        patterns_cache_key(channel_id, top_n),
+        lambda: run_with_session(pattern_analyzer.analyze_channel_patterns, channel_id=channel_id, top_n=top_n),
+        PATTERNS_CACHE_TTL_SECONDS,
+    )
+
+
 # Request/Response Models
 class AnalyzeChannelRequest(BaseModel):
     channel_id: int
@@ -47,28 +95,25 @@ class IndexVideoRequest(BaseModel):
 @router.post("/analyze-patterns")
 async def analyze_channel_patterns(
     request: AnalyzeChannelRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
     """
     Analyze performance patterns from top videos.
     """
     # Verify channel belongs to user
-    channel = db.query(Channel).filter(
-        Channel.id == request.channel_id,
-        Channel.owner_id == current_user.id
-    ).first()
+    channel = (await db.execute(
+        select(Channel).where(
+            Channel.id == request.channel_id,
+            Channel.owner_id == current_user.id
+        )
+    )).scalar_one_or_none()
 
     if not channel:
         raise HTTPException(status_code=404, detail="Channel not found or not authorized")
 
-    # Analyze patterns
-    pattern_analyzer = get_pattern_analyzer()
-    patterns = pattern_analyzer.analyze_channel_patterns(
-        db,
-        channel_id=request.channel_id,
-        top_n=request.top_n
-    )
+    # Analyze patterns off the event loop, or reuse a recent analysis
+    patterns = await _channel_patterns(request.channel_id, request.top_n)
 
     return patterns
 
@@ -76,23 +121,27 @@ async def analyze_channel_patterns(
 @router.post("/generate-script")
 async def generate_script(
     request: GenerateScriptRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
     """
     Generate a video script using RAG and channel insights.
     """
     # Verify channel belongs to user
-    channel = db.query(Channel).filter(
-        Channel.id == request.channel_id,
-        Channel.owner_id == current_user.id
-    ).first()
+    channel = (await db.execute(
+        select(Channel).where(
+            Channel.id == request.channel_id,
+            Channel.owner_id == current_user.id
+        )
+    )).scalar_one_or_none()
 
     if not channel:
         raise HTTPException(status_code=404, detail="Channel not found or not authorized")
 
     # Generate script using Celery task
-    task = generate_script_with_rag.delay(
+    task = await queue_user_task(
+        current_user.id,
+        generate_script_with_rag.delay,
         topic=request.topic,
         channel_id=request.channel_id,
         tone=request.tone,
@@ -100,37 +149,36 @@ async def generate_script(
         video_format=request.video_format
     )
 
-    # Get result (with timeout)
-    try:
-        result = task.get(timeout=60)  # 60 second timeout
-        return result
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Script generation failed: {str(e)}")
+    # Don't hold the request open for the LLM - poll /api/tasks/{task_id}
+    return {"task_id": task.id, "status": "pending"}
 
 
 @router.post("/generate-titles")
 async def generate_titles(
     request: GenerateTitlesRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
     """
     Generate and score title variations for a video topic.
     """
     # Verify channel belongs to user
-    channel = db.query(Channel).filter(
-        Channel.id == request.channel_id,
-        Channel.owner_id == current_user.id
-    ).first()
+    channel = (await db.execute(
+        select(Channel).where(
+            Channel.id == request.channel_id,
+            Channel.owner_id == current_user.id
+        )
+    )).scalar_one_or_none()
 
     if not channel:
         raise HTTPException(status_code=404, detail="Channel not found or not authorized")
 
     # Generate titles
     title_optimizer = get_title_optimizer()
-    titles = title_optimizer.generate_title_variations(
+    titles = await asyncio.to_thread(
+        run_with_session,
+        title_optimizer.generate_title_variations,
         topic=request.topic,
-        db=db,
         channel_id=request.channel_id,
         count=request.count
     )
@@ -145,25 +193,14 @@ async def generate_titles(
 @router.post("/index-video")
 async def index_video_transcript(
     request: IndexVideoRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
     """
     Index a video's transcript in the vector store for RAG.
     """
-    # Get video and verify ownership
-    video = db.query(Video).filter(Video.id == request.video_id).first()
-    if not video:
-        raise HTTPException(status_code=404, detail="Video not found")
-
-    # Verify channel belongs to user
-    channel = db.query(Channel).filter(
-        Channel.id == video.channel_id,
-        Channel.owner_id == current_user.id
-    ).first()
-
-    if not channel:
-        raise HTTPException(status_code=403, detail="Not authorized")
+    # Get video and verify ownership in one joined query
+    video = await get_video_owned_by(db, request.video_id, current_user.id)
 
     # Check if transcript exists
     if not video.transcript_s3_key:
@@ -175,15 +212,17 @@ async def index_video_transcript(
     # Fetch transcript from storage
     storage_client = get_storage_client()
     try:
-        transcript_data_raw = storage_client.get_object(video.transcript_s3_key)
-        transcript_data = json.loads(transcript_data_raw.decode('utf-8'))
+        # boto3 is blocking - keep the S3 round trip off the event loop
+        transcript_data_raw = await asyncio.to_thread(storage_client.get_object, video.transcript_s3_key)
+        transcript_data = orjson.loads(transcript_data_raw)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch transcript: {e}")
 
     # Index in vector store
     vector_store = get_vector_store()
     try:
-        chunks_count = vector_store.index_transcript(
+        chunks_count = await asyncio.to_thread(
+            vector_store.index_transcript,
             video_id=str(video.id),
             youtube_video_id=video.youtube_video_id,
             transcript_data=transcript_data,
@@ -210,36 +249,50 @@ async def index_video_transcript(
 @router.get("/insights/{channel_id}")
 async def get_channel_insights(
     channel_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
     """
     Get comprehensive insights for a channel.
     Combines pattern analysis with video stats.
     """
     # Verify channel belongs to user
-    channel = db.query(Channel).filter(
-        Channel.id == channel_id,
-        Channel.owner_id == current_user.id
-    ).first()
+    channel = (await db.execute(
+        select(Channel).where(
+            Channel.id == channel_id,
+            Channel.owner_id == current_user.id
+        )
+    )).scalar_one_or_none()
 
     if not channel:
         raise HTTPException(status_code=404, detail="Channel not found or not authorized")
 
     # Get basic stats
-    total_videos = db.query(Video).filter(Video.channel_id == channel_id).count()
-    transcribed_videos = db.query(Video).filter(
-        Video.channel_id == channel_id,
-        Video.transcript_s3_key.isnot(None)
-    ).count()
-
-    # Get pattern analysis
-    pattern_analyzer = get_pattern_analyzer()
-    patterns = pattern_analyzer.analyze_channel_patterns(db, channel_id, top_n=10)
+    # Both counts in one scan - COUNT(column) skips NULL transcript keys
+    total_videos, transcribed_videos = (await db.execute(
+        select(func.count(), func.count(Video.transcript_s3_key)).where(Video.channel_id == channel_id)
+    )).one()
+
+    # Get pattern analysis - materialized per channel by the insights worker.
+    # An old row is still returned while a refresh runs in the background.
+    insight = await db.get(ChannelInsight, channel_id)
+    if insight is None:
+        patterns = await asyncio.to_thread(run_with_session, store_channel_insights, channel_id=channel_id)
+        response.headers["X-Cache"] = "miss"
+    elif datetime.utcnow() - insight.computed_at > INSIGHTS_MAX_AGE:
+        patterns = insight.patterns_json
+        await queue_insights_refresh_async(channel_id)
+        response.headers["X-Cache"] = "stale-while-revalidate"
+    else:
+        patterns = insight.patterns_json
+        response.headers["X-Cache"] = "hit"
 
     # Get vector store stats
     vector_store = get_vector_store()
-    vector_stats = vector_store.get_collection_stats()
+    vector_stats = await _cached_json(
+        VECTOR_STATS_CACHE_KEY, vector_store.get_collection_stats, PATTERNS_CACHE_TTL_SECONDS
+    )
 
     return {
         "channel": {
@@ -261,108 +314,57 @@ async def get_channel_insights(
 @router.post("/process-video-pipeline/{video_id}")
 async def process_video_pipeline(
     video_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
     """
-    Run the complete video processing pipeline:
+    Queue the complete video processing pipeline:
     1. Download audio (if needed)
     2. Transcribe (if needed)
     3. Index in vector store
 
-    This is a convenience endpoint that runs all steps.
+    Returns the task ID immediately; poll /api/tasks/{task_id} for the result.
     """
-    from app.services.ingest_worker import download_audio
-    from app.services.transcribe_worker import transcribe_audio
-
-    # Get video and verify ownership
-    video = db.query(Video).filter(Video.id == video_id).first()
-    if not video:
-        raise HTTPException(status_code=404, detail="Video not found")
+    from app.services.pipeline_worker import video_pipeline
 
-    # Verify channel belongs to user
-    channel = db.query(Channel).filter(
-        Channel.id == video.channel_id,
-        Channel.owner_id == current_user.id
-    ).first()
+    # Get video and verify ownership in one joined query
+    video = await get_video_owned_by(db, video_id, current_user.id)
 
-    if not channel:
-        raise HTTPException(status_code=403, detail="Not authorized")
+    # The chain's ID is its last stage, so it resolves to the pipeline result
+    task = await queue_user_task(current_user.id, video_pipeline(video.id, video.youtube_video_id).apply_async)
 
-    pipeline_status = {
+    return {
+        "task_id": task.id,
+        "status": "pending",
         "video_id": video.id,
-        "youtube_video_id": video.youtube_video_id,
-        "steps": []
+        "youtube_video_id": video.youtube_video_id
     }
 
-    # Step 1: Download audio
-    if not video.audio_s3_key:
-        try:
-            audio_task = download_audio.delay(video.youtube_video_id)
-            audio_result = audio_task.get(timeout=300)
-
-            if audio_result["status"] == "success":
-                video.audio_s3_key = audio_result["s3_key"]
-                db.add(video)
-                db.commit()
-                pipeline_status["steps"].append({"step": "audio_download", "status": "success"})
-            else:
-                pipeline_status["steps"].append({"step": "audio_download", "status": "failed", "error": audio_result.get("error")})
-                return pipeline_status
-        except Exception as e:
-            pipeline_status["steps"].append({"step": "audio_download", "status": "failed", "error": str(e)})
-            return pipeline_status
-    else:
-        pipeline_status["steps"].append({"step": "audio_download", "status": "skipped", "reason": "already exists"})
 
-    # Step 2: Transcribe
-    if not video.transcript_s3_key:
-        try:
-            transcribe_task = transcribe_audio.delay(video.audio_s3_key, video.youtube_video_id)
-            transcribe_result = transcribe_task.get(timeout=600)
-
-            if transcribe_result["status"] == "success":
-                video.transcript_s3_key = transcribe_result["transcript_s3_key"]
-                db.add(video)
-                db.commit()
-                pipeline_status["steps"].append({"step": "transcribe", "status": "success"})
-            else:
-                pipeline_status["steps"].append({"step": "transcribe", "status": "failed", "error": transcribe_result.get("error")})
-                return pipeline_status
-        except Exception as e:
-            pipeline_status["steps"].append({"step": "transcribe", "status": "failed", "error": str(e)})
-            return pipeline_status
-    else:
-        pipeline_status["steps"].append({"step": "transcribe", "status": "skipped", "reason": "already exists"})
+@router.post("/process-channel-pipeline/{channel_id}")
+async def process_channel_pipeline(
+    channel_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_user)
+):
+    """
+    Queue batch indexing of every transcribed, not yet indexed video in a channel.
 
-    # Step 3: Index in vector store
-    try:
-        storage_client = get_storage_client()
-        transcript_data_raw = storage_client.get_object(video.transcript_s3_key)
-        transcript_data = json.loads(transcript_data_raw.decode('utf-8'))
+    Returns the task ID immediately; poll /api/tasks/{task_id} for the result.
+    """
+    from app.services.pipeline_worker import index_channel_transcripts
 
-        vector_store = get_vector_store()
-        chunks_count = vector_store.index_transcript(
-            video_id=str(video.id),
-            youtube_video_id=video.youtube_video_id,
-            transcript_data=transcript_data,
-            metadata={
-                "views": video.views,
-                "likes": video.likes,
-                "title": video.title,
-                "duration": video.duration_seconds
-            }
+    # Verify channel belongs to user
+    channel = (await db.execute(
+        select(Channel).where(
+            Channel.id == channel_id,
+            Channel.owner_id == current_user.id
         )
+    )).scalar_one_or_none()
 
-        pipeline_status["steps"].append({
-            "step": "vector_index",
-            "status": "success",
-            "chunks_indexed": chunks_count
-        })
-
-    except Exception as e:
-        pipeline_status["steps"].append({"step": "vector_index", "status": "failed", "error": str(e)})
+    if not channel:
+        raise HTTPException(status_code=404, detail="Channel not found or not authorized")
 
-    pipeline_status["complete"] = all(step["status"] in ["success", "skipped"] for step in pipeline_status["steps"])
+    task = await queue_user_task(current_user.id, index_channel_transcripts.delay, channel.id)
 
-    return pipeline_status
+    return {"task_id": task.id, "status": "pending", "channel_id": channel.id}
@@ -1,14 +1,15 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.db.session import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_async_db
 from app.models.models import Video
 
 router = APIRouter()
 
 
 @router.get("")
-def top_performers(db: Session = Depends(get_db)):
-    vids = db.query(Video).order_by(Video.views.desc()).limit(5).all()
+async def top_performers(db: AsyncSession = Depends(get_async_db)):
+    vids = (await db.scalars(select(Video).order_by(Video.views.desc()).limit(5))).all()
     # Placeholder insights
     insights = {
         "drivers": ["Engaging hooks", "Clear thumbnails"],
@@ -0,0 +1,91 @@
+"""
+API endpoints for polling background (Celery) task status.
+"""
+import asyncio
+from typing import Any, Callable
+from celery.result import AsyncResult
+from fastapi import APIRouter, Depends, HTTPException
+from redis.exceptions import RedisError
+from celery_worker import app as celery_app
+from app.api.channels import get_current_user
+from app.core.security import UserPrincipal
+from app.db.redis_client import get_async_redis
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+router = APIRouter()
+
+# Matches Celery's default result_expires - the owner is only needed while a result exists
+TASK_OWNER_TTL_SECONDS = 24 * 60 * 60
+
+
+def task_owner_key(task_id: str) -> str:
+    """Redis key recording which user queued a task"""
+    return f"task-owner:{task_id}"
+
+
+async def record_task_owner(task_id: str, user_id: int):
+    """
+    Record the user who queued a task, so only they can read its result.
+
+    Args:
+        task_id: Celery task ID returned to the client
+        user_id: ID of the user who queued the task
+    """
+    try:
+        await get_async_redis().set(task_owner_key(task_id), user_id, ex=TASK_OWNER_TTL_SECONDS)
+    except RedisError as e:
+        # The task still runs; its status just won't be readable through /api/tasks
+        logger.warning(f"Could not record owner of task {task_id}: {e}")
+
+
+async def queue_user_task(user_id: int, publish: Callable[..., AsyncResult], *args: Any, **kwargs: Any) -> AsyncResult:
+    """
+    Queue a task for a user and record them as its owner.
+
+    Args:
+        user_id: ID of the user queueing the task
+        publish: Blocking publish call, e.g. a task's delay or a canvas's apply_async
+        *args, **kwargs: Arguments for publish
+
+    Returns:
+        The queued task's result handle
+    """
+    # Publishing to the broker is blocking - keep it off the event loop
+    task = await asyncio.to_thread(publish, *args, **kwargs)
+    await record_task_owner(task.id, user_id)
+    return task
+
+
+def _task_status(task_id: str) -> dict:
+    """Read a task's state and result from the result backend (blocking)"""
+    task = AsyncResult(task_id, app=celery_app)
+    response = {"task_id": task_id, "state": task.state}
+    if task.ready():
+        # Failed tasks store the exception - report its message instead
+        response["result"] = task.result if task.successful() else str(task.result)
+    return response
+
+
+@router.get("/{task_id}")
+async def get_task_status(
+    task_id: str,
+    current_user: UserPrincipal = Depends(get_current_user)
+):
+    """
+    Get the state of a queued task, and its result once it has finished.
+
+    Only the user who queued the task can read it; anyone else gets a 404.
+    """
+    try:
+        owner = await get_async_redis().get(task_owner_key(task_id))
+    except RedisError as e:
+        logger.warning(f"Could not read owner of task {task_id}: {e}")
+        raise HTTPException(status_code=503, detail="Task status temporarily unavailable")
+
+    if owner is None or int(owner) != current_user.id:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    # The result backend client is blocking - keep it off the event loop
+    return await asyncio.to_thread(_task_status, task_id)
@@ -1,7 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 from pydantic import BaseModel
-from app.db.session import get_db
+from app.db.session import get_async_db
 from app.models.models import Video, Idea, Script
 
 
@@ -9,13 +11,19 @@ router = APIRouter()
 
 
 @router.get("")
-def list_videos(page: int = 1, page_size: int = 6, db: Session = Depends(get_db)):
-    q = db.query(Video).order_by(Video.id.desc())
-    total = q.count()
-    items = q.offset((page - 1) * page_size).limit(page_size).all()
+async def list_videos(cursor: int | None = None, page_size: int = 6, db: AsyncSession = Depends(get_async_db)):
+    # Keyset pagination: seek past the last ID seen instead of OFFSET + COUNT(*)
+    query = select(Video).order_by(Video.id.desc()).limit(page_size + 1)
+    if cursor is not None:
+        query = query.where(Video.id < cursor)
+    items = (await db.scalars(query)).all()
+    # The extra row only tells us whether there is another page
+    next_cursor = None
+    if len(items) > page_size:
+        items = items[:page_size]
+        next_cursor = items[-1].id
     return {
-        "total": total,
-        "page": page,
+        "next_cursor": next_cursor,
         "page_size": page_size,
         "items": [
             {
@@ -34,12 +42,17 @@ def list_videos(page: int = 1, page_size: int = 6, db: Session = Depends(get_db)
 
 
 @router.get("/{video_id}")
-def get_video(video_id: int, db: Session = Depends(get_db)):
-    v = db.get(Video, video_id)
+async def get_video(video_id: int, db: AsyncSession = Depends(get_async_db)):
+    # Video, its ideas and their scripts in one LEFT JOIN query
+    v = (await db.scalars(
+        select(Video)
+        .where(Video.id == video_id)
+        .options(joinedload(Video.ideas).joinedload(Idea.scripts))
+    )).unique().one_or_none()
     if not v:
         raise HTTPException(404)
-    idea = db.query(Idea).filter(Idea.video_id == v.id).order_by(Idea.id.desc()).first()
-    scripts = db.query(Script).join(Idea, Script.idea_id == Idea.id).filter(Idea.video_id == v.id).all()
+    idea = v.ideas[0] if v.ideas else None
+    scripts = [s for i in v.ideas for s in i.scripts]
     return {
         "id": v.id,
         "title": v.title,
@@ -63,11 +76,10 @@ class ScriptRequest(BaseModel):
 
 
 @router.post("/script")
-def create_script(payload: ScriptRequest, db: Session = Depends(get_db)):
+async def create_script(payload: ScriptRequest, db: AsyncSession = Depends(get_async_db)):
     s = Script(idea_id=payload.idea_id, content_md="# Draft Script\n\n...", tone=payload.tone, minutes=payload.minutes)
     db.add(s)
-    db.commit()
-    db.refresh(s)
+    await db.commit()
     return {"id": s.id}
 
 
@@ -11,6 +11,12 @@ from .logging_config import (
     LogExecutionTime,
     log_execution_time,
 )
+from .config import Settings, get_settings
+from .security import (
+    UserPrincipal,
+    create_session_token,
+    decode_session_token,
+)
 
 __all__ = [
     "setup_logging",
@@ -20,4 +26,9 @@ __all__ = [
     "clear_request_id",
     "LogExecutionTime",
     "log_execution_time",
+    "Settings",
+    "get_settings",
+    "UserPrincipal",
+    "create_session_token",
+    "decode_session_token",
 ]
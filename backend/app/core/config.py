@@ -0,0 +1,39 @@
+"""
+Application settings for AI YouTuber Studio
+
+Environment variables are read and validated once into a frozen Settings
+object; use get_settings() (or Depends(get_settings)) to access them.
+"""
+
+from functools import lru_cache
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    """Typed application configuration loaded from the environment"""
+
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore", frozen=True)
+
+    # Google OAuth
+    google_client_id: str = ""
+    google_client_secret: str = ""
+    # This must also be whitelisted in your Google Cloud OAuth "Authorized redirect URIs"
+    google_oauth_redirect_uri: str = "http://localhost:8000/api/auth/oauth/google/callback"
+
+    # Change this to your deployed frontend URL in production
+    frontend_url: str = "http://localhost:3000"
+
+    # Redis (Celery broker, locks)
+    redis_url: str = "redis://redis:6379/0"
+
+    # Session tokens - JWT_SECRET is required: a built-in default would let a
+    # deployment that forgets it sign sessions with a publicly known key
+    jwt_secret: str
+    session_ttl_seconds: int = 3600
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """Get the process-wide settings singleton"""
+    return Settings()
@@ -9,12 +9,15 @@ Provides standardized logging setup for the entire application including:
 - Performance metric logging
 """
 
+import atexit
+import functools
 import logging
 import logging.handlers
 import os
+import queue
 import sys
+import time
 from pathlib import Path
-from datetime import datetime
 from typing import Optional
 import uuid
 from contextvars import ContextVar
@@ -22,17 +25,18 @@ from contextvars import ContextVar
 # Context variable for request tracking
 request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
 
-
-class RequestIDFilter(logging.Filter):
-    """Add request ID to log records for correlation"""
-
-    def filter(self, record):
-        record.request_id = request_id_var.get() or "N/A"
-        return True
+# Writes records to the real handlers on a background thread (see setup_logging)
+_queue_listener: Optional[logging.handlers.QueueListener] = None
 
 
 class ColoredFormatter(logging.Formatter):
-    """Colored console output for better readability"""
+    """
+    Colored console output for better readability.
+
+    The escape codes come from the levelcolor/levelreset fields that
+    RequestIDFilter sets, so the record's levelname is never modified and
+    the file handlers formatting the same record don't get ANSI codes.
+    """
 
     COLORS = {
         'DEBUG': '\033[0;36m',  # Cyan
@@ -43,11 +47,15 @@ class ColoredFormatter(logging.Formatter):
     }
     RESET = '\033[0m'
 
-    def format(self, record):
-        # Add color to level name
-        if record.levelname in self.COLORS:
-            record.levelname = f"{self.COLORS[record.levelname]}{record.levelname}{self.RESET}"
-        return super().format(record)
+
+class RequestIDFilter(logging.Filter):
+    """Add request ID (and console color fields) to log records for correlation"""
+
+    def filter(self, record):
+        record.request_id = request_id_var.get() or "N/A"
+        record.levelcolor = ColoredFormatter.COLORS.get(record.levelname, "")
+        record.levelreset = ColoredFormatter.RESET if record.levelcolor else ""
+        return True
 
 
 def setup_logging(
@@ -95,7 +103,7 @@ def setup_logging(
 
     if enable_colored_output and sys.stdout.isatty():
         console_format = ColoredFormatter(
-            fmt='[%(asctime)s] [%(levelname)s] [req:%(request_id)s] [%(name)s] %(message)s',
+            fmt='[%(asctime)s] [%(levelcolor)s%(levelname)-8s%(levelreset)s] [req:%(request_id)s] [%(name)s] %(message)s',
             datefmt='%Y-%m-%d %H:%M:%S'
         )
     else:
@@ -105,8 +113,7 @@ def setup_logging(
         )
 
     console_handler.setFormatter(console_format)
-    console_handler.addFilter(RequestIDFilter())
-    root_logger.addHandler(console_handler)
+    handlers = [console_handler]
 
     # File handler with rotation (if enabled)
     if enable_file_logging:
@@ -124,8 +131,7 @@ def setup_logging(
             datefmt='%Y-%m-%d %H:%M:%S'
         )
         file_handler.setFormatter(file_format)
-        file_handler.addFilter(RequestIDFilter())
-        root_logger.addHandler(file_handler)
+        handlers.append(file_handler)
 
         # Error file handler - separate file for errors only
         error_file = log_dir / "errors.log"
@@ -137,8 +143,19 @@ def setup_logging(
         )
         error_handler.setLevel(logging.ERROR)
         error_handler.setFormatter(file_format)
-        error_handler.addFilter(RequestIDFilter())
-        root_logger.addHandler(error_handler)
+        handlers.append(error_handler)
+
+    # Loggers only enqueue records; stdout/file writes and rotation happen on the
+    # listener thread. The request ID filter stays on the enqueueing side, where
+    # the request's context variables are visible.
+    global _queue_listener
+    _stop_queue_listener()
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(RequestIDFilter())
+    root_logger.addHandler(queue_handler)
+    _queue_listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _queue_listener.start()
 
     # Reduce verbosity of some third-party loggers
     logging.getLogger("urllib3").setLevel(logging.WARNING)
@@ -156,6 +173,17 @@ def setup_logging(
     return root_logger
 
 
+def _stop_queue_listener():
+    """Flush queued records and stop the listener thread, if running"""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+atexit.register(_stop_queue_listener)
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get a logger instance for a module.
@@ -200,19 +228,21 @@ class LogExecutionTime:
         self.logger = logger
         self.operation = operation
         self.level = level
-        self.start_time = None
+        self.start_ns = None
 
     def __enter__(self):
-        self.start_time = datetime.now()
-        self.logger.log(self.level, f"{self.operation} - Started")
+        self.start_ns = time.perf_counter_ns()
+        if self.logger.isEnabledFor(self.level):
+            self.logger.log(self.level, "%s - Started", self.operation)
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        duration = (datetime.now() - self.start_time).total_seconds() * 1000
+        duration = (time.perf_counter_ns() - self.start_ns) / 1e6
         if exc_type is None:
-            self.logger.log(self.level, f"{self.operation} - Completed in {duration:.2f}ms")
+            if self.logger.isEnabledFor(self.level):
+                self.logger.log(self.level, "%s - Completed in %.2fms", self.operation, duration)
         else:
-            self.logger.error(f"{self.operation} - Failed after {duration:.2f}ms: {exc_val}")
+            self.logger.error("%s - Failed after %.2fms: %s", self.operation, duration, exc_val)
         return False  # Don't suppress exceptions
 
 
@@ -230,21 +260,24 @@ def log_execution_time(operation_name: str = None):
         nonlocal operation_name
         if operation_name is None:
             operation_name = f"{func.__module__}.{func.__name__}"
+        logger = logging.getLogger(func.__module__)
 
+        @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            logger = logging.getLogger(func.__module__)
-            start_time = datetime.now()
-            logger.info(f"{operation_name} - Started")
+            start_ns = time.perf_counter_ns()
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("%s - Started", operation_name)
 
             try:
                 result = func(*args, **kwargs)
-                duration = (datetime.now() - start_time).total_seconds() * 1000
-                logger.info(f"{operation_name} - Completed in {duration:.2f}ms")
-                return result
             except Exception as e:
-                duration = (datetime.now() - start_time).total_seconds() * 1000
-                logger.error(f"{operation_name} - Failed after {duration:.2f}ms: {e}", exc_info=True)
+                duration = (time.perf_counter_ns() - start_ns) / 1e6
+                logger.error("%s - Failed after %.2fms: %s", operation_name, duration, e, exc_info=True)
                 raise
+            if logger.isEnabledFor(logging.INFO):
+                duration = (time.perf_counter_ns() - start_ns) / 1e6
+                logger.info("%s - Completed in %.2fms", operation_name, duration)
+            return result
 
         return wrapper
     return decorator
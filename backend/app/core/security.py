@@ -0,0 +1,63 @@
+"""
+Session token helpers for AI YouTuber Studio
+
+Issues and verifies short-lived HS256 JWTs used as the session cookie, so
+authenticated requests can identify the user without a database lookup.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import jwt
+
+from .config import get_settings
+
+JWT_ALGORITHM = "HS256"
+SESSION_COOKIE_NAME = "session"
+
+
+@dataclass(frozen=True)
+class UserPrincipal:
+    """Lightweight authenticated user decoded from the session token"""
+    id: int
+    email: Optional[str] = None
+
+
+def create_session_token(user_id: int, email: Optional[str] = None) -> str:
+    """
+    Create a signed session token for a user.
+
+    Args:
+        user_id: Database user ID
+        email: User email
+
+    Returns:
+        Encoded JWT
+    """
+    settings = get_settings()
+    now = int(time.time())
+    payload = {
+        "sub": str(user_id),
+        "email": email,
+        "iat": now,
+        "exp": now + settings.session_ttl_seconds,
+    }
+    return jwt.encode(payload, settings.jwt_secret, algorithm=JWT_ALGORITHM)
+
+
+def decode_session_token(token: str) -> UserPrincipal:
+    """
+    Verify a session token and return the user it identifies.
+
+    Args:
+        token: Encoded JWT from the session cookie
+
+    Returns:
+        UserPrincipal for the token's subject
+
+    Raises:
+        jwt.InvalidTokenError: If the token is invalid or expired
+    """
+    payload = jwt.decode(token, get_settings().jwt_secret, algorithms=[JWT_ALGORITHM])
+    return UserPrincipal(id=int(payload["sub"]), email=payload.get("email"))
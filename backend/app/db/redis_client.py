@@ -0,0 +1,26 @@
+"""
+Shared async Redis client for request handlers.
+
+One connection pool per process, used for locks, short-lived response caches
+and the /ws pubsub relay. Responses stay as bytes (no decode_responses) so
+payloads pass through without a decode/re-encode round trip.
+"""
+import os
+import redis.asyncio as aioredis
+from app.core.config import get_settings
+
+# Upper bound on sockets per process - every open /ws holds one for its pubsub
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "64"))
+
+_pool = aioredis.ConnectionPool.from_url(get_settings().redis_url, max_connections=REDIS_MAX_CONNECTIONS)
+_redis = aioredis.Redis(connection_pool=_pool)
+
+
+def get_async_redis() -> aioredis.Redis:
+    """Get the shared async Redis client"""
+    return _redis
+
+
+async def close_async_redis():
+    """Close the pool's connections - called once at app shutdown"""
+    await _pool.disconnect()
@@ -0,0 +1,64 @@
+"""
+Request-scoped memoization of primary-key lookups.
+
+Collapses repeated User/Channel reads made by different dependencies and
+handlers while serving a single request.
+"""
+from typing import Any, Dict, Tuple, Type
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+RequestCache = Dict[Tuple[type, Any], Any]
+
+
+class RequestCacheMiddleware:
+    """ASGI middleware that attaches an empty cache to every HTTP request"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            scope.setdefault("state", {})["cache"] = {}
+        await self.app(scope, receive, send)
+
+
+def get_request_cache(request: Request) -> RequestCache:
+    """Dependency returning the current request's lookup cache"""
+    cache = getattr(request.state, "cache", None)
+    if cache is None:
+        cache = request.state.cache = {}
+    return cache
+
+
+def cached_get(db: Session, model: Type, pk: Any, cache: RequestCache):
+    """
+    Get a row by primary key, reusing the result within the same request.
+
+    Args:
+        db: Database session
+        model: ORM model class
+        pk: Primary key value
+        cache: Request cache from get_request_cache
+
+    Returns:
+        Model instance or None
+    """
+    key = (model, pk)
+    if key not in cache:
+        cache[key] = db.get(model, pk)
+    return cache[key]
+
+
+async def cached_get_async(db: AsyncSession, model: Type, pk: Any, cache: RequestCache):
+    """Async-session variant of cached_get"""
+    key = (model, pk)
+    if key not in cache:
+        cache[key] = await db.get(model, pk)
+    return cache[key]
+
+
+def invalidate(cache: RequestCache, model: Type, pk: Any) -> None:
+    """Drop a cached row after it has been deleted or replaced"""
+    cache.pop((model, pk), None)
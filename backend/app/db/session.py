@@ -1,5 +1,6 @@
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 
 
@@ -13,6 +14,14 @@ class Base(DeclarativeBase):
 engine = create_engine(DATABASE_URL, pool_pre_ping=True)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine (psycopg 3) for request handlers, so DB I/O in async endpoints
+# overlaps with other requests instead of blocking the event loop
+async_engine = create_async_engine(
+    make_url(DATABASE_URL).set(drivername="postgresql+psycopg"), pool_pre_ping=True
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
 def get_db():
     db = SessionLocal()
     try:
@@ -21,3 +30,22 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def run_with_session(fn, **kwargs):
+    """
+    Call fn(db=..., **kwargs) with a short-lived sync session.
+
+    For blocking service code (sync queries plus LLM calls) that async
+    endpoints offload with asyncio.to_thread.
+    """
+    db = SessionLocal()
+    try:
+        return fn(db=db, **kwargs)
+    finally:
+        db.close()
+
+
@@ -3,62 +3,123 @@ load_dotenv()
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import ORJSONResponse, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from typing import Optional
 import os
 import asyncio
-import redis
+from contextlib import asynccontextmanager
+import logging
 import time
-from app.api import auth, channels, videos, insights, transcripts, content_studio
+from concurrent.futures import ThreadPoolExecutor
+from app.api import auth, channels, videos, insights, transcripts, content_studio, tasks
+from app.services import google_api, youtube_client
+from app.services.storage_client import get_storage_client
+from app.services.vector_store import get_vector_store
+from app.services.pattern_analyzer import get_pattern_analyzer
+from app.services.title_optimizer import get_title_optimizer
+from app.services.metrics_poller import METRICS_SHARDS, metrics_channel, metrics_snapshot_key
+from app.db.request_cache import RequestCacheMiddleware
+from app.db.redis_client import close_async_redis, get_async_redis
+from redis.exceptions import RedisError
 from app.core.logging_config import setup_logging, get_logger, set_request_id, clear_request_id
 
 # Initialize logging
 setup_logging()
 logger = get_logger(__name__)
 
-app = FastAPI(default_response_class=ORJSONResponse, title="AI YouTuber Studio")
+
+# Application lifecycle
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm shared clients and start the metrics broadcaster; tear down on exit"""
+    logger.info("=" * 80)
+    logger.info("AI YouTuber Studio Backend - Starting Up")
+    logger.info(f"Environment: {os.getenv('ENV', 'development')}")
+    logger.info(f"CORS Origins: {origins}")
+    logger.info("=" * 80)
+    # asyncio.to_thread runs blocking googleapiclient calls here - size it so
+    # concurrent video syncs don't queue behind the small default pool
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=BLOCKING_IO_WORKERS, thread_name_prefix="blocking-io")
+    )
+    await google_api.prefetch_signing_keys()
+    youtube_client.warm_discovery_cache()
+    # Chroma/S3 clients connect on construction - build them off the event loop
+    await asyncio.to_thread(warm_service_singletons)
+    metrics_broadcaster = asyncio.create_task(broadcast_metrics())
+
+    yield
+
+    metrics_broadcaster.cancel()
+    await asyncio.gather(metrics_broadcaster, return_exceptions=True)
+    await close_async_redis()
+    logger.info("=" * 80)
+    logger.info("AI YouTuber Studio Backend - Shutting Down")
+    logger.info("=" * 80)
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse, title="AI YouTuber Studio")
 
 logger.info("FastAPI application initialized")
 
 
 # Request/Response Logging Middleware
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware to log all HTTP requests and responses"""
+class LoggingMiddleware:
+    """
+    ASGI middleware to log all HTTP requests and responses.
+
+    Plain ASGI rather than BaseHTTPMiddleware: no Request/Response objects or
+    extra task per request, and websocket scopes pass straight through.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-    async def dispatch(self, request: Request, call_next):
         # Generate and set request ID
         request_id = set_request_id()
+        method = scope["method"]
+        path = scope["path"]
 
         # Log request
-        logger.info(
-            f"Request: {request.method} {request.url.path} "
-            f"[client:{request.client.host if request.client else 'unknown'}] "
-            f"[user-agent:{request.headers.get('user-agent', 'unknown')[:50]}]"
-        )
+        if logger.isEnabledFor(logging.INFO):
+            client = scope.get("client")
+            user_agent = dict(scope["headers"]).get(b"user-agent", b"unknown").decode("latin-1")
+            logger.info(
+                f"Request: {method} {path} "
+                f"[client:{client[0] if client else 'unknown'}] "
+                f"[user-agent:{user_agent[:50]}]"
+            )
 
         # Track timing
-        start_time = time.time()
+        start_time = time.perf_counter()
 
-        try:
-            response = await call_next(request)
-            duration_ms = (time.time() - start_time) * 1000
-
-            # Log response
-            log_level = logger.info if response.status_code < 400 else logger.error
-            log_level(
-                f"Response: {request.method} {request.url.path} "
-                f"[status:{response.status_code}] "
-                f"[duration:{duration_ms:.2f}ms]"
-            )
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                duration_ms = (time.perf_counter() - start_time) * 1000
+                status_code = message["status"]
 
-            # Add request ID to response headers
-            response.headers["X-Request-ID"] = request_id
+                # Log response
+                log_level = logger.info if status_code < 400 else logger.error
+                log_level(
+                    f"Response: {method} {path} "
+                    f"[status:{status_code}] "
+                    f"[duration:{duration_ms:.2f}ms]"
+                )
 
-            return response
+                # Add request ID to response headers
+                message["headers"] = [*message.get("headers", ()), (b"x-request-id", request_id.encode())]
+            await send(message)
 
+        try:
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
-            duration_ms = (time.time() - start_time) * 1000
+            duration_ms = (time.perf_counter() - start_time) * 1000
             logger.error(
-                f"Request failed: {request.method} {request.url.path} "
+                f"Request failed: {method} {path} "
                 f"[duration:{duration_ms:.2f}ms] [error:{str(e)}]",
                 exc_info=True
             )
@@ -70,6 +131,7 @@ class LoggingMiddleware(BaseHTTPMiddleware):
 
 # Add middleware
 app.add_middleware(LoggingMiddleware)
+app.add_middleware(RequestCacheMiddleware)
 
 origins = os.getenv("BACKEND_CORS_ORIGINS", "http://localhost:3000").split(",")
 app.add_middleware(
@@ -86,31 +148,26 @@ app.include_router(videos.router, prefix="/api/videos", tags=["videos"])
 app.include_router(insights.router, prefix="/api/insights", tags=["insights"])
 app.include_router(transcripts.router, prefix="/api/transcripts", tags=["transcripts"])
 app.include_router(content_studio.router, prefix="/api/content-studio", tags=["content-studio"])
+app.include_router(tasks.router, prefix="/api/tasks", tags=["tasks"])
 
 logger.info("All API routers registered")
 
-redis_url = os.getenv("REDIS_URL", "redis://redis:6379/0")
-redis_client = redis.Redis.from_url(redis_url, decode_responses=True)
-logger.info(f"Redis client initialized: {redis_url}")
-
+# Worker threads for blocking I/O offloaded from the event loop
+BLOCKING_IO_WORKERS = int(os.getenv("BLOCKING_IO_WORKERS", "32"))
 
-# Application lifecycle events
-@app.on_event("startup")
-async def startup_event():
-    """Log application startup"""
-    logger.info("=" * 80)
-    logger.info("AI YouTuber Studio Backend - Starting Up")
-    logger.info(f"Environment: {os.getenv('ENV', 'development')}")
-    logger.info(f"CORS Origins: {origins}")
-    logger.info("=" * 80)
 
+def warm_service_singletons():
+    """
+    Create the lazily-built service singletons (S3 client, Chroma collection,
+    LLM providers) so the first request that needs them doesn't pay for it.
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Log application shutdown"""
-    logger.info("=" * 80)
-    logger.info("AI YouTuber Studio Backend - Shutting Down")
-    logger.info("=" * 80)
+    A backend that is down only logs a warning - its getter retries on first use.
+    """
+    for getter in (get_storage_client, get_vector_store, get_pattern_analyzer, get_title_optimizer):
+        try:
+            getter()
+        except Exception as e:
+            logger.warning(f"Could not warm {getter.__name__}: {e}")
 
 
 @app.get("/")
@@ -123,23 +180,81 @@ async def health():
     return {"status": "ok"}
 
 
+# Most metrics updates relayed to a client in one websocket frame
+WS_MAX_BATCH = 128
+# Updates buffered per client; a client this far behind loses the oldest
+WS_QUEUE_SIZE = 256
+
+# Connected /ws clients: each one's update queue -> the pubsub channels it wants
+_ws_clients: dict[asyncio.Queue, frozenset[bytes]] = {}
+
+
+async def broadcast_metrics():
+    """
+    Relay metrics updates from one pubsub subscription per process to every
+    connected /ws client, instead of one Redis subscription per socket.
+
+    Reconnects after Redis errors; runs until cancelled at shutdown.
+    """
+    while True:
+        pubsub = get_async_redis().pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(*(metrics_channel(shard) for shard in METRICS_SHARDS))
+            async for message in pubsub.listen():
+                for queue, wanted in _ws_clients.items():
+                    if message["channel"] not in wanted:
+                        continue
+                    if queue.full():
+                        queue.get_nowait()
+                    queue.put_nowait(message["data"])
+        except RedisError as e:
+            logger.warning(f"Metrics pubsub failed, resubscribing: {e}")
+            await asyncio.sleep(1)
+        finally:
+            try:
+                await pubsub.aclose()
+            except Exception:
+                pass
+
+
 @app.websocket("/ws")
-async def ws_endpoint(ws: WebSocket):
+async def ws_endpoint(ws: WebSocket, channels: Optional[str] = None):
+    """
+    Relay metrics updates to the client.
+
+    ?channels=subs,top3 picks the metrics shards to receive (default: all of
+    METRICS_SHARDS); unknown names are ignored.
+
+    Every frame is a binary frame holding a UTF-8 JSON array of update
+    payloads: whatever arrived while the previous frame was being written goes
+    out together (up to WS_MAX_BATCH), so a burst of publishes costs one send
+    instead of one per message. Payloads are relayed as the raw bytes Redis
+    delivered, never decoded.
+
+    The first frame holds the latest stored snapshot of each requested shard,
+    since the poller only publishes when a shard changes.
+    """
     await ws.accept()
-    pubsub = redis_client.pubsub()
-    pubsub.subscribe("metrics_updates")
+    shards = [c for c in (channels or "").split(",") if c in METRICS_SHARDS] or METRICS_SHARDS
+    queue: asyncio.Queue = asyncio.Queue(maxsize=WS_QUEUE_SIZE)
+    # Register before reading the snapshots so no publish falls in between
+    _ws_clients[queue] = frozenset(metrics_channel(shard).encode() for shard in shards)
     try:
+        try:
+            snapshots = [s for s in await get_async_redis().mget([metrics_snapshot_key(shard) for shard in shards]) if s]
+        except RedisError as e:
+            logger.warning(f"Could not read metrics snapshots: {e}")
+            snapshots = []
+        if snapshots:
+            await ws.send_bytes(b"[" + b",".join(snapshots) + b"]")
         while True:
-            message = pubsub.get_message(timeout=1.0)
-            if message and message.get("type") == "message":
-                await ws.send_text(message.get("data"))
-            await asyncio.sleep(0.1)
+            batch = [await queue.get()]
+            while len(batch) < WS_MAX_BATCH and not queue.empty():
+                batch.append(queue.get_nowait())
+            await ws.send_bytes(b"[" + b",".join(batch) + b"]")
+            # Let the broadcaster deliver anything that landed during the send
+            await asyncio.sleep(0)
     except WebSocketDisconnect:
         pass
     finally:
-        try:
-            pubsub.close()
-        except Exception:
-            pass
-
-
+        _ws_clients.pop(queue, None)
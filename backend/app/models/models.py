@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, Integer, DateTime, ForeignKey, Text, Float, Boolean, Enum
+from sqlalchemy import String, Integer, DateTime, ForeignKey, Text, Float, Boolean, Enum, Index, text
+from sqlalchemy.dialects.postgresql import JSONB
 from datetime import datetime
 from app.db.session import Base
 import enum
@@ -21,22 +22,31 @@ class User(Base):
     __tablename__ = "users"
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     email: Mapped[str] = mapped_column(String(255), unique=True, index=True)
+    google_sub: Mapped[str | None] = mapped_column(String(255), unique=True, index=True, nullable=True)
     google_refresh_token: Mapped[str | None] = mapped_column(Text, nullable=True)
+    google_access_token: Mapped[str | None] = mapped_column(Text, nullable=True)
+    google_token_expiry: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     channels: Mapped[list["Channel"]] = relationship(back_populates="owner")
 
 
 class Channel(Base):
     __tablename__ = "channels"
+    __table_args__ = (
+        # Covers "channels owned by user" lookups (/me, ownership checks)
+        Index("ix_channels_owner_id_id", "owner_id", "id"),
+    )
     id: Mapped[int] = mapped_column(primary_key=True)
     owner_id: Mapped[int | None] = mapped_column(ForeignKey("users.id"), nullable=True)
-    youtube_channel_id: Mapped[str] = mapped_column(String(128), index=True)
+    youtube_channel_id: Mapped[str] = mapped_column(String(128), unique=True, index=True)
     name: Mapped[str] = mapped_column(String(255))
     avatar_url: Mapped[str | None] = mapped_column(Text, nullable=True)
     subscribers: Mapped[int] = mapped_column(Integer, default=0)
     verified: Mapped[bool] = mapped_column(Boolean, default=False)
     total_views: Mapped[int] = mapped_column(Integer, default=0) # Must be here
     total_watch_hours: Mapped[float] = mapped_column(Float, default=0.0) # Must be here
+    uploads_playlist_id: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    data_api_etag: Mapped[str | None] = mapped_column(String(128), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     owner: Mapped[User | None] = relationship(back_populates="channels")
     videos: Mapped[list["Video"]] = relationship(back_populates="channel")
@@ -44,9 +54,29 @@ class Channel(Base):
 
 class Video(Base):
     __tablename__ = "videos"
+    __table_args__ = (
+        # Covers per-channel video lookups and the total/transcribed counts
+        # in channel insights as one index-only scan
+        Index("ix_videos_channel_id_transcript_s3_key", "channel_id", "transcript_s3_key"),
+        # Top-N by views per channel is an ordered range read, with the other
+        # hot metrics carried in the index instead of fetched from the wide row
+        Index(
+            "ix_videos_channel_id_views",
+            "channel_id",
+            text("views DESC"),
+            postgresql_include=["likes", "ctr"],
+        ),
+        # Transcribed videos still waiting for vector indexing - the batch
+        # indexer's lookup. Partial, so it only holds the (small) backlog
+        Index(
+            "ix_videos_channel_id_unindexed",
+            "channel_id",
+            postgresql_where=text("transcript_s3_key IS NOT NULL AND indexed_at IS NULL"),
+        ),
+    )
     id: Mapped[int] = mapped_column(primary_key=True)
     channel_id: Mapped[int] = mapped_column(ForeignKey("channels.id"))
-    youtube_video_id: Mapped[str] = mapped_column(String(32), index=True)
+    youtube_video_id: Mapped[str] = mapped_column(String(32), unique=True, index=True)
     title: Mapped[str] = mapped_column(String(512))
     thumbnail_url: Mapped[str | None] = mapped_column(Text)
     duration_seconds: Mapped[int] = mapped_column(Integer, default=0)
@@ -67,6 +97,8 @@ class Video(Base):
     )
     processing_error: Mapped[str | None] = mapped_column(Text, nullable=True)
     indexed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    # Newest first, so ideas[0] is the latest
+    ideas: Mapped[list["Idea"]] = relationship(back_populates="video", order_by="Idea.id.desc()")
 
 
 class Idea(Base):
@@ -77,6 +109,8 @@ class Idea(Base):
     ideas_json: Mapped[str] = mapped_column(Text)
     outline: Mapped[str] = mapped_column(Text)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    video: Mapped[Video] = relationship(back_populates="ideas")
+    scripts: Mapped[list["Script"]] = relationship(back_populates="idea")
 
 
 class Script(Base):
@@ -87,5 +121,12 @@ class Script(Base):
     tone: Mapped[str | None] = mapped_column(String(64))
     minutes: Mapped[int | None] = mapped_column(Integer)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    idea: Mapped[Idea] = relationship(back_populates="scripts")
 
 
+class ChannelInsight(Base):
+    """Materialized pattern analysis per channel, refreshed by the insights worker"""
+    __tablename__ = "channel_insights"
+    channel_id: Mapped[int] = mapped_column(ForeignKey("channels.id", ondelete="CASCADE"), primary_key=True)
+    patterns_json: Mapped[dict] = mapped_column(JSONB)
+    computed_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
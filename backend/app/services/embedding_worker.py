@@ -1,10 +1,37 @@
 from celery_worker import app as celery_app
-from app.services.llm_provider import get_provider
+from app.services.llm_provider import get_llm_provider
+from app.services.vector_store import EMBED_BATCH_SIZE
 
 
 @celery_app.task
 def embed_texts(texts: list[str]) -> list[list[float]]:
-    provider = get_provider()
-    return provider.embed(texts)
+    return embed_texts_batch([texts])[0]
 
 
+@celery_app.task
+def embed_texts_batch(text_groups: list[list[str]]) -> list[list[list[float]]]:
+    """
+    Embed several callers' texts with as few provider requests as possible.
+
+    The groups are flattened and sent in EMBED_BATCH_SIZE requests, then the
+    vectors are split back per group - one round trip for many small jobs
+    instead of one each.
+
+    Args:
+        text_groups: One list of texts per job
+
+    Returns:
+        One list of vectors per job, in the same order
+    """
+    provider = get_llm_provider()
+    texts = [text for group in text_groups for text in group]
+    vectors = []
+    for i in range(0, len(texts), EMBED_BATCH_SIZE):
+        vectors.extend(provider.embed(texts[i:i + EMBED_BATCH_SIZE]))
+
+    results = []
+    offset = 0
+    for group in text_groups:
+        results.append(vectors[offset:offset + len(group)])
+        offset += len(group)
+    return results
@@ -2,75 +2,49 @@
 RAG-powered content generation worker for scripts and ideas.
 """
 from celery_worker import app as celery_app
+from app.core.config import get_settings
+from app.core.logging_config import get_logger
 from app.services.llm_provider import get_llm_provider
-from app.services.vector_store import get_vector_store
+from app.services.vector_store import (
+    SEARCH_CACHE_TTL_SECONDS,
+    SEARCH_GENERATION_KEY,
+    get_vector_store,
+    search_cache_key,
+)
 from typing import Optional, Dict, List
 import json
+import orjson
+import redis
 
+logger = get_logger(__name__)
 
-@celery_app.task
-def generate_summary_and_ideas(transcript_excerpt: str) -> dict:
-    """Legacy function - kept for backward compatibility"""
-    provider = get_llm_provider()
-    prompt = (
-        "You are an expert YouTube strategist. Given transcript excerpts and metadata,\n"
-        "return: 1) summary (3 sentences) 2) 3 creative video ideas relevant to the channel style\n"
-        "3) a script outline for the top idea (Hook → Intro → Body → CTA)\n"
-        "Output JSON only: { \"summary\": \"\", \"ideas\": [], \"outline\": \"\" }\n\n"
-        f"Transcript: {transcript_excerpt}"
-    )
-    text = provider.generate(prompt)
-    return {"raw": text}
-
-
-@celery_app.task
-def generate_script_with_rag(
-    topic: str,
-    channel_id: int,
-    tone: Optional[str] = None,
-    minutes: Optional[int] = 8,
-    video_format: str = "standard"
-) -> Dict:
-    """
-    Generate a video script using RAG to retrieve context from successful videos.
-
-    Args:
-        topic: Video topic/idea
-        channel_id: Channel ID for context retrieval
-        tone: Script tone (casual, professional, educational, etc.)
-        minutes: Target duration in minutes
-        video_format: 'standard', 'short', or 'tutorial'
-
-    Returns:
-        Dictionary with script and metadata
-    """
-    llm_provider = get_llm_provider()
-    vector_store = get_vector_store()
+_redis = redis.Redis.from_url(get_settings().redis_url)
 
-    # Retrieve relevant context from vector store
-    search_query = f"successful video about {topic} with engaging hook and high retention"
-    relevant_chunks = vector_store.search(query=search_query, n_results=5)
+# Prompt templates - the constant text is built once at import, tasks only
+# substitute their values
 
-    # Build context from retrieved chunks
-    context_sections = []
-    for i, chunk in enumerate(relevant_chunks[:3], 1):
-        context_sections.append(
-            f"Example {i} (from a video with {chunk['metadata'].get('views', 0):,} views):\n{chunk['text']}"
-        )
+SUMMARY_PROMPT = (
+    "You are an expert YouTube strategist. Given transcript excerpts and metadata,\n"
+    "return: 1) summary (3 sentences) 2) 3 creative video ideas relevant to the channel style\n"
+    "3) a script outline for the top idea (Hook → Intro → Body → CTA)\n"
+    "Output JSON only: { \"summary\": \"\", \"ideas\": [], \"outline\": \"\" }\n\n"
+    "Transcript: %s"
+)
 
-    context = "\n\n".join(context_sections) if context_sections else "No previous examples available."
+OUTLINE_SCRIPT_PROMPT = (
+    "Write a full YouTube script (~%s minutes) with tone: %s.\n"
+    "Use this outline: %s"
+)
 
-    # Build prompt based on format
-    if video_format == "short":
-        format_instructions = """
+FORMAT_SHORT = """
 Create a 60-second YouTube Short script with:
 - Hook (first 2 seconds)
 - Body (key points with fast pacing)
 - CTA (call-to-action at end)
 
 Use short sentences, visual cues, and captions."""
-    elif video_format == "tutorial":
-        format_instructions = f"""
+
+FORMAT_TUTORIAL = """
 Create a {minutes}-minute tutorial script with:
 - Hook (problem statement)
 - Introduction (what they'll learn)
@@ -78,8 +52,8 @@ Create a {minutes}-minute tutorial script with:
 - Conclusion (recap + CTA)
 
 Be clear and actionable."""
-    else:
-        format_instructions = f"""
+
+FORMAT_STANDARD = """
 Create a {minutes}-minute video script with:
 - Hook (first 10 seconds to grab attention)
 - Introduction (set expectations)
@@ -88,9 +62,9 @@ Create a {minutes}-minute video script with:
 
 Keep it engaging and conversational."""
 
-    tone_instruction = f"Tone: {tone}" if tone else "Tone: Conversational and engaging"
+_FORMATS = {"short": FORMAT_SHORT, "tutorial": FORMAT_TUTORIAL, "standard": FORMAT_STANDARD}
 
-    prompt = f"""You are an expert YouTube script writer. Generate a video script based on successful patterns from the channel.
+SCRIPT_PROMPT = """You are an expert YouTube script writer. Generate a video script based on successful patterns from the channel.
 
 TOPIC: {topic}
 
@@ -124,15 +98,121 @@ Return ONLY valid JSON in this format:
 
 Generate the script now:"""
 
+_json_decoder = json.JSONDecoder()
+
+
+def _extract_json_object(text: str) -> Optional[Dict]:
+    """
+    Decode the first JSON object in an LLM response.
+
+    Decoding is tried at each "{" in turn, so braces in prose before the
+    object (e.g. "use {topic} here") are skipped. raw_decode stops at the end
+    of the object, so anything after it is ignored too.
+
+    Returns:
+        The decoded object, or None if the response has no valid JSON object
+    """
+    start = text.find("{")
+    while start != -1:
+        try:
+            obj, _ = _json_decoder.raw_decode(text, start)
+        except ValueError:
+            obj = None
+        if isinstance(obj, dict):
+            return obj
+        start = text.find("{", start + 1)
+    return None
+
+
+def _search_context(query: str, n_results: int) -> List[Dict]:
+    """
+    vector_store.search() through a Redis cache, so regenerating a script for
+    the same topic skips the query embedding and the Chroma round trip.
+
+    Redis being down only costs the cache - the search still runs.
+    """
+    key = None
+    try:
+        key = search_cache_key(int(_redis.get(SEARCH_GENERATION_KEY) or 0), query, n_results)
+        cached = _redis.get(key)
+        if cached is not None:
+            return orjson.loads(cached)
+    except redis.RedisError as e:
+        logger.warning(f"RAG search cache unavailable: {e}")
+
+    results = get_vector_store().search(query=query, n_results=n_results)
+    if key is not None and results:
+        try:
+            _redis.set(key, orjson.dumps(results), ex=SEARCH_CACHE_TTL_SECONDS)
+        except redis.RedisError as e:
+            logger.warning(f"Could not cache RAG search: {e}")
+    return results
+
+
+@celery_app.task
+def generate_summary_and_ideas(transcript_excerpt: str) -> dict:
+    """Legacy function - kept for backward compatibility"""
+    provider = get_llm_provider()
+    prompt = SUMMARY_PROMPT % transcript_excerpt
+    text = provider.generate(prompt)
+    return {"raw": text}
+
+
+@celery_app.task
+def generate_script_with_rag(
+    topic: str,
+    channel_id: int,
+    tone: Optional[str] = None,
+    minutes: Optional[int] = 8,
+    video_format: str = "standard"
+) -> Dict:
+    """
+    Generate a video script using RAG to retrieve context from successful videos.
+
+    Args:
+        topic: Video topic/idea
+        channel_id: Channel ID for context retrieval
+        tone: Script tone (casual, professional, educational, etc.)
+        minutes: Target duration in minutes
+        video_format: 'standard', 'short', or 'tutorial'
+
+    Returns:
+        Dictionary with script and metadata
+    """
+    llm_provider = get_llm_provider()
+
+    # Retrieve relevant context from vector store
+    search_query = f"successful video about {topic} with engaging hook and high retention"
+    relevant_chunks = _search_context(search_query, n_results=5)
+
+    # Build context from retrieved chunks
+    context_sections = []
+    for i, chunk in enumerate(relevant_chunks[:3], 1):
+        context_sections.append(
+            f"Example {i} (from a video with {chunk['metadata'].get('views', 0):,} views):\n{chunk['text']}"
+        )
+
+    context = "\n\n".join(context_sections) if context_sections else "No previous examples available."
+
+    # Build prompt based on format
+    format_instructions = _FORMATS.get(video_format, FORMAT_STANDARD).format(minutes=minutes)
+
+    tone_instruction = f"Tone: {tone}" if tone else "Tone: Conversational and engaging"
+
+    prompt = SCRIPT_PROMPT.format(
+        topic=topic,
+        tone_instruction=tone_instruction,
+        format_instructions=format_instructions,
+        context=context,
+    )
+
     try:
         response = llm_provider.generate(prompt)
 
         # Try to extract JSON from response
-        json_start = response.find("{")
-        json_end = response.rfind("}") + 1
+        script_json = _extract_json_object(response)
 
-        if json_start != -1 and json_end > json_start:
-            script_json = json.loads(response[json_start:json_end])
+        if script_json is not None:
             return {
                 "status": "success",
                 "script": script_json,
@@ -163,10 +243,7 @@ Generate the script now:"""
 def generate_script(outline: str, tone: Optional[str] = None, minutes: Optional[int] = 8) -> str:
     """Legacy script generation - kept for backward compatibility"""
     provider = get_llm_provider()
-    prompt = (
-        f"Write a full YouTube script (~{minutes} minutes) with tone: {tone or 'default'}.\n"
-        f"Use this outline: {outline}"
-    )
+    prompt = OUTLINE_SCRIPT_PROMPT % (minutes, tone or 'default', outline)
     return provider.generate(prompt)
 
 
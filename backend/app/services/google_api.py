@@ -0,0 +1,226 @@
+"""
+Async HTTP client for Google OAuth, YouTube Data API and YouTube Analytics API.
+
+Uses a single shared httpx.AsyncClient so request handlers can await Google
+without blocking the event loop, and TLS connections are reused across requests.
+"""
+import re
+import time
+from datetime import date
+from typing import Optional
+import httpx
+import jwt
+from app.core.config import get_settings
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+TOKEN_URI = "https://oauth2.googleapis.com/token"
+YOUTUBE_CHANNELS_URL = "https://www.googleapis.com/youtube/v3/channels"
+YOUTUBE_ANALYTICS_REPORTS_URL = "https://youtubeanalytics.googleapis.com/v2/reports"
+GOOGLE_CERTS_URL = "https://www.googleapis.com/oauth2/v3/certs"
+GOOGLE_ISSUERS = ["https://accounts.google.com", "accounts.google.com"]
+
+# channels.list accepts at most this many comma-separated IDs per call
+CHANNELS_LIST_MAX_IDS = 50
+
+# Returned by conditional requests when the resource matches the sent ETag
+NOT_MODIFIED = object()
+
+# Arbitrary early date used as 'all time' start for Analytics queries
+ANALYTICS_START_DATE = "2000-01-01"
+
+# Shared client - reused across requests for connection pooling.
+# Google's global batch endpoint is retired and can't mix the Data and Analytics
+# APIs, so concurrent calls are instead multiplexed over one HTTP/2 connection
+# per host, which saves the same handshakes.
+_http_client = httpx.AsyncClient(
+    http2=True,
+    timeout=10,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=60),
+)
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared async HTTP client"""
+    return _http_client
+
+
+# Google's ID token signing keys, keyed by kid, cached for the Cache-Control max-age
+_jwks_cache: dict = {"keys": {}, "expires_at": 0.0}
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+async def _refresh_signing_keys() -> None:
+    response = await _http_client.get(GOOGLE_CERTS_URL)
+    response.raise_for_status()
+    match = _MAX_AGE_RE.search(response.headers.get("cache-control", ""))
+    max_age = int(match.group(1)) if match else 3600
+    _jwks_cache["keys"] = {jwk["kid"]: jwt.PyJWK(jwk).key for jwk in response.json()["keys"]}
+    _jwks_cache["expires_at"] = time.monotonic() + max_age
+    logger.info(f"Loaded {len(_jwks_cache['keys'])} Google signing keys (max-age: {max_age}s)")
+
+
+async def _get_signing_key(kid: str):
+    if time.monotonic() >= _jwks_cache["expires_at"] or kid not in _jwks_cache["keys"]:
+        await _refresh_signing_keys()
+    try:
+        return _jwks_cache["keys"][kid]
+    except KeyError:
+        raise jwt.InvalidTokenError(f"Unknown signing key: {kid}")
+
+
+async def prefetch_signing_keys() -> None:
+    """Warm the signing key cache so the first login doesn't pay for the fetch"""
+    try:
+        await _refresh_signing_keys()
+    except Exception as e:
+        logger.warning(f"Could not prefetch Google signing keys: {e}")
+
+
+async def verify_id_token(id_token: str) -> dict:
+    """
+    Verify a Google ID token's signature, audience and issuer.
+
+    Args:
+        id_token: ID token from the OAuth token response
+
+    Returns:
+        Decoded token claims (sub, email, ...)
+
+    Raises:
+        jwt.InvalidTokenError: If the token fails verification
+    """
+    kid = jwt.get_unverified_header(id_token).get("kid")
+    key = await _get_signing_key(kid)
+    return jwt.decode(
+        id_token,
+        key=key,
+        algorithms=["RS256"],
+        audience=get_settings().google_client_id,
+        issuer=GOOGLE_ISSUERS,
+    )
+
+
+def _auth_headers(access_token: str) -> dict:
+    return {"Authorization": f"Bearer {access_token}"}
+
+
+async def exchange_code(code: str, redirect_uri: str) -> dict:
+    """
+    Exchange an OAuth authorization code for tokens.
+
+    Args:
+        code: Authorization code from the Google redirect
+        redirect_uri: Redirect URI used when building the authorization URL
+
+    Returns:
+        Token response with access_token, refresh_token, id_token, expires_in
+    """
+    settings = get_settings()
+    response = await _http_client.post(TOKEN_URI, data={
+        "code": code,
+        "client_id": settings.google_client_id,
+        "client_secret": settings.google_client_secret,
+        "redirect_uri": redirect_uri,
+        "grant_type": "authorization_code",
+    })
+    response.raise_for_status()
+    return response.json()
+
+
+async def refresh_access_token(refresh_token: str) -> dict:
+    """
+    Get a new access token using a refresh token.
+
+    Args:
+        refresh_token: User's Google refresh token
+
+    Returns:
+        Token response with access_token, expires_in (and refresh_token if rotated)
+    """
+    settings = get_settings()
+    response = await _http_client.post(TOKEN_URI, data={
+        "refresh_token": refresh_token,
+        "client_id": settings.google_client_id,
+        "client_secret": settings.google_client_secret,
+        "grant_type": "refresh_token",
+    })
+    response.raise_for_status()
+    return response.json()
+
+
+def refresh_access_token_sync(refresh_token: str) -> dict:
+    """
+    Blocking variant of refresh_access_token for Celery workers (no event loop).
+
+    Args:
+        refresh_token: User's Google refresh token
+
+    Returns:
+        Token response with access_token, expires_in (and refresh_token if rotated)
+    """
+    settings = get_settings()
+    response = httpx.post(TOKEN_URI, timeout=10, data={
+        "refresh_token": refresh_token,
+        "client_id": settings.google_client_id,
+        "client_secret": settings.google_client_secret,
+        "grant_type": "refresh_token",
+    })
+    response.raise_for_status()
+    return response.json()
+
+
+async def fetch_channels(access_token: str, etag: Optional[str] = None, **params):
+    """
+    Call YouTube Data API channels.list.
+
+    Args:
+        access_token: OAuth access token
+        etag: ETag of a previous identical response, sent as If-None-Match
+        **params: Query parameters (e.g. mine="true" or id="UC...")
+
+    Returns:
+        channels.list response body, or NOT_MODIFIED if it still matches `etag`
+    """
+    params.setdefault("part", "snippet,statistics,contentDetails")
+    headers = _auth_headers(access_token)
+    if etag:
+        headers["If-None-Match"] = etag
+    response = await _http_client.get(
+        YOUTUBE_CHANNELS_URL,
+        params=params,
+        headers=headers,
+    )
+    if response.status_code == 304:
+        return NOT_MODIFIED
+    response.raise_for_status()
+    return response.json()
+
+
+async def fetch_watch_hours(access_token: str, youtube_channel_id: Optional[str] = None) -> Optional[float]:
+    """
+    Fetch all-time watch hours from the YouTube Analytics API.
+
+    Args:
+        access_token: OAuth access token
+        youtube_channel_id: YouTube channel ID, or None for the authenticated user's channel
+
+    Returns:
+        Total watch hours, or None if the API returned no rows
+    """
+    response = await _http_client.get(
+        YOUTUBE_ANALYTICS_REPORTS_URL,
+        params={
+            "ids": f"channel=={youtube_channel_id or 'MINE'}",
+            "startDate": ANALYTICS_START_DATE,
+            "endDate": date.today().isoformat(),
+            "metrics": "estimatedMinutesWatched",
+        },
+        headers=_auth_headers(access_token),
+    )
+    response.raise_for_status()
+    body = response.json()
+    if body and body.get("rows"):
+        return float(body["rows"][0][0]) / 60.0
+    return None
@@ -0,0 +1,154 @@
+"""
+Google access token management for authenticated users.
+
+Access tokens are stored on the User row with their expiry, so API calls
+reuse a still-valid token instead of paying a refresh round trip each time.
+"""
+import asyncio
+import weakref
+from datetime import datetime, timedelta
+from redis.exceptions import LockError, RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.models import User
+from app.services import google_api
+from app.db.redis_client import get_async_redis
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Refresh when the stored token has less than this much lifetime left
+REFRESH_MARGIN = timedelta(seconds=60)
+
+# Background refreshes run this long before expiry (must exceed REFRESH_MARGIN)
+PROACTIVE_REFRESH_LEAD = timedelta(seconds=120)
+
+# Concurrent refreshes with the same refresh token can get the token family
+# revoked, so refreshes are serialized per user - in-process and across workers
+REFRESH_LOCK_TIMEOUT = 10
+REFRESH_LOCK_WAIT = 5
+
+
+def refresh_lock_name(user_id: int) -> str:
+    """Redis lock key guarding a user's token refresh"""
+    return f"gtok:{user_id}"
+
+
+# Background refreshes keep rescheduling themselves only for users who used
+# their token this recently, so idle users stop refreshing
+ACTIVE_USER_WINDOW = timedelta(hours=24)
+
+
+def active_user_key(user_id: int) -> str:
+    """Redis key marking that a user recently needed their Google token"""
+    return f"gtok-active:{user_id}"
+
+
+_local_locks: "weakref.WeakValueDictionary[int, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+
+def store_token_response(user: User, token_response: dict, now: datetime | None = None) -> None:
+    """
+    Copy an OAuth token response onto the user (caller commits).
+
+    Args:
+        user: User to update
+        token_response: Response from the Google token endpoint
+        now: Time the token was issued (default: utcnow)
+    """
+    now = now or datetime.utcnow()
+    user.google_access_token = token_response["access_token"]
+    user.google_token_expiry = now + timedelta(seconds=int(token_response.get("expires_in", 3600)))
+    rotated_refresh_token = token_response.get("refresh_token")
+    if rotated_refresh_token:
+        user.google_refresh_token = rotated_refresh_token
+
+
+def has_valid_token(
+    user: User, now: datetime | None = None, margin: timedelta = REFRESH_MARGIN
+) -> bool:
+    """Whether the user's stored access token is usable for at least `margin`"""
+    now = now or datetime.utcnow()
+    return bool(
+        user.google_access_token
+        and user.google_token_expiry
+        and user.google_token_expiry - now > margin
+    )
+
+
+async def schedule_proactive_refresh(user_id: int, token_expiry: datetime | None) -> None:
+    """
+    Schedule a background refresh shortly before the user's access token expires,
+    so request handlers normally find a valid token and skip the refresh RTT.
+
+    Args:
+        user_id: Database user ID
+        token_expiry: Expiry of the access token just stored for the user
+    """
+    from app.services.token_worker import refresh_google_token
+
+    if not token_expiry:
+        return
+    try:
+        # Publishing to the broker is blocking - keep it off the event loop
+        await asyncio.to_thread(
+            refresh_google_token.apply_async, args=[user_id], eta=token_expiry - PROACTIVE_REFRESH_LEAD
+        )
+    except Exception as e:
+        logger.warning(f"Could not schedule proactive token refresh for user {user_id}: {e}")
+
+
+async def get_access_token(db: AsyncSession, user: User) -> str:
+    """
+    Get a valid Google access token, refreshing it only when close to expiry.
+
+    Args:
+        db: Database session
+        user: User with a google_refresh_token
+
+    Returns:
+        Access token
+
+    Raises:
+        httpx.HTTPError: If the refresh request fails
+    """
+    try:
+        await get_async_redis().set(active_user_key(user.id), 1, ex=ACTIVE_USER_WINDOW)
+    except RedisError as e:
+        logger.warning(f"Could not mark user {user.id} active: {e}")
+
+    if has_valid_token(user):
+        return user.google_access_token
+
+    lock = _local_locks.setdefault(user.id, asyncio.Lock())
+    async with lock:
+        redis_lock = get_async_redis().lock(
+            refresh_lock_name(user.id), timeout=REFRESH_LOCK_TIMEOUT, blocking_timeout=REFRESH_LOCK_WAIT
+        )
+        try:
+            acquired = await redis_lock.acquire()
+        except RedisError as e:
+            logger.warning(f"Token refresh lock unavailable for user {user.id}: {e}")
+            acquired = False
+
+        try:
+            return await _refresh_if_needed(db, user)
+        finally:
+            if acquired:
+                try:
+                    await redis_lock.release()
+                except LockError:
+                    pass  # Expired while refreshing - nothing to release
+
+
+async def _refresh_if_needed(db: AsyncSession, user: User) -> str:
+    # Another request or worker may have refreshed while we waited for the lock
+    await db.refresh(user, attribute_names=["google_access_token", "google_token_expiry", "google_refresh_token"])
+    if has_valid_token(user):
+        return user.google_access_token
+
+    logger.debug(f"Refreshing Google access token for user {user.id}")
+    token_response = await google_api.refresh_access_token(user.google_refresh_token)
+    store_token_response(user, token_response)
+    await db.commit()
+    await schedule_proactive_refresh(user.id, user.google_token_expiry)
+    return user.google_access_token
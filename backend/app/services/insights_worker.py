@@ -1,10 +1,34 @@
+import asyncio
+from datetime import datetime, timedelta
+import redis
 from celery_worker import app as celery_app
-from app.services.llm_provider import get_provider
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from app.core.config import get_settings
+from app.db.session import SessionLocal
+from app.models.models import Channel, ChannelInsight
+from app.services.llm_provider import get_llm_provider
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Materialized insights analyze this many top videos per channel
+INSIGHTS_TOP_N = 10
+
+# Insights older than this are still served, but trigger a background refresh
+INSIGHTS_MAX_AGE = timedelta(hours=1)
+
+# At most one on-demand insights refresh is queued per channel in this window,
+# running at its end
+INSIGHTS_REFRESH_GUARD_SECONDS = 300
+
+_redis = redis.Redis.from_url(get_settings().redis_url)
 
 
 @celery_app.task
 def generate_top_performer_insights(context: str) -> dict:
-    provider = get_provider()
+    provider = get_llm_provider()
     prompt = (
         "Analyze why these videos performed well:\n"
         "- Use title, transcript, comments, and metrics\n"
@@ -16,3 +40,89 @@ def generate_top_performer_insights(context: str) -> dict:
     return {"raw": text}
 
 
+def store_channel_insights(db: Session, channel_id: int) -> dict:
+    """
+    Run the pattern analysis for a channel and upsert it into channel_insights.
+
+    Args:
+        db: Database session
+        channel_id: Channel ID
+
+    Returns:
+        The freshly computed pattern analysis
+    """
+    from app.services.pattern_analyzer import get_pattern_analyzer
+
+    patterns = get_pattern_analyzer().analyze_channel_patterns(db, channel_id, top_n=INSIGHTS_TOP_N)
+    values = {"patterns_json": patterns, "computed_at": datetime.utcnow()}
+    db.execute(
+        pg_insert(ChannelInsight)
+        .values(channel_id=channel_id, **values)
+        .on_conflict_do_update(index_elements=[ChannelInsight.channel_id], set_=values)
+    )
+    db.commit()
+    return patterns
+
+
+@celery_app.task(name="app.services.insights_worker.refresh_channel_insights")
+def refresh_channel_insights(channel_id: int | None = None) -> dict:
+    """
+    Recompute materialized insights for one channel, or for every channel
+    (the hourly beat schedule).
+
+    Args:
+        channel_id: Channel ID, or None for all channels
+    """
+    db = SessionLocal()
+    try:
+        channel_ids = [channel_id] if channel_id is not None else db.scalars(select(Channel.id)).all()
+        refreshed = 0
+        for cid in channel_ids:
+            try:
+                store_channel_insights(db, cid)
+                refreshed += 1
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Failed to refresh insights for channel {cid}: {e}")
+    finally:
+        db.close()
+
+    logger.info(f"Refreshed insights for {refreshed}/{len(channel_ids)} channels")
+    return {"success": True, "channels_refreshed": refreshed}
+
+
+def _insights_refresh_guard_key(channel_id: int) -> str:
+    return f"insights-refresh:{channel_id}"
+
+
+def _publish_insights_refresh(channel_id: int):
+    # Trailing refresh: it runs when the guard window ends, so it also covers
+    # every event the guard swallowed in the meantime
+    refresh_channel_insights.apply_async(args=[channel_id], countdown=INSIGHTS_REFRESH_GUARD_SECONDS)
+
+
+def queue_insights_refresh(channel_id: int):
+    """Queue a materialized insights refresh, at most one per channel per guard window"""
+    try:
+        queued = _redis.set(_insights_refresh_guard_key(channel_id), 1, nx=True, ex=INSIGHTS_REFRESH_GUARD_SECONDS)
+    except redis.RedisError as e:
+        logger.warning(f"Insights refresh guard unavailable: {e}")
+        queued = True
+    if queued:
+        _publish_insights_refresh(channel_id)
+
+
+async def queue_insights_refresh_async(channel_id: int):
+    """Async variant of queue_insights_refresh for request handlers"""
+    from app.db.redis_client import get_async_redis
+
+    try:
+        queued = await get_async_redis().set(
+            _insights_refresh_guard_key(channel_id), 1, nx=True, ex=INSIGHTS_REFRESH_GUARD_SECONDS
+        )
+    except redis.RedisError as e:
+        logger.warning(f"Insights refresh guard unavailable: {e}")
+        queued = True
+    if queued:
+        # Publishing to the broker is blocking - keep it off the event loop
+        await asyncio.to_thread(_publish_insights_refresh, channel_id)
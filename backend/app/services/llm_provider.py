@@ -1,10 +1,31 @@
 import os
+import hashlib
+from functools import lru_cache
 from abc import ABC, abstractmethod
+from typing import Callable
+import orjson
+import redis
+from app.core.config import get_settings
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Embedding model for real embeddings, e.g. text-embedding-3-small (OpenAI) or
+# models/text-embedding-004 (Gemini). Unset keeps the placeholder vectors -
+# switching changes the vector size, so the Chroma collection must be rebuilt
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL")
+
+# Per-text embeddings are cached in Redis, so re-indexing the same transcript
+# chunks (or repeating a search query) costs no API call
+EMBED_CACHE_TTL_SECONDS = 7 * 24 * 3600
+
+_redis = redis.Redis.from_url(get_settings().redis_url)
 
 
 class LLMProvider(ABC):
     @abstractmethod
-    def embed(self, texts: list[str]) -> list[list[float]]:  # pragma: no cover
+    def embed(self, texts: list[str], is_query: bool = False) -> list[list[float]]:  # pragma: no cover
+        """Embed texts - is_query marks search queries, for models that embed them differently"""
         ...
 
     @abstractmethod
@@ -16,7 +37,9 @@ class LLMProvider(ABC):
         ...
 
 
+@lru_cache(maxsize=1)
 def get_llm_provider() -> "LLMProvider":
+    """Get the configured LLM provider - built once per process and shared"""
     provider = os.getenv("LLM_PROVIDER", "gemini").lower()
     if provider == "openai":
         from app.services.providers.openai_provider import OpenAIProvider
@@ -25,3 +48,68 @@ def get_llm_provider() -> "LLMProvider":
     return GeminiProvider()
 
 
+def _embed_cache_key(model: str, text: str, task: str | None = None) -> str:
+    """Redis key for one text's cached embedding"""
+    digest = hashlib.sha256(text.encode()).hexdigest()
+    return f"emb:{model}:{task}:{digest}" if task else f"emb:{model}:{digest}"
+
+
+def _embed_in_batches(
+    texts: list[str],
+    embed_batch: Callable[[list[str]], list[list[float]]],
+    max_batch: int | None
+) -> list[list[float]]:
+    """Call embed_batch on slices of at most max_batch texts (all at once if None)"""
+    if not max_batch or len(texts) <= max_batch:
+        return embed_batch(texts)
+    vectors = []
+    for start in range(0, len(texts), max_batch):
+        vectors.extend(embed_batch(texts[start:start + max_batch]))
+    return vectors
+
+
+def cached_embed(
+    model: str,
+    texts: list[str],
+    embed_batch: Callable[[list[str]], list[list[float]]],
+    max_batch: int | None = None,
+    task: str | None = None
+) -> list[list[float]]:
+    """
+    Embed texts, serving repeats from Redis and sending only the misses to
+    the provider - in as few embed_batch calls as its batch limit allows.
+
+    Redis being down only costs the cache - every text is embedded.
+
+    Args:
+        model: Embedding model name (part of the cache key)
+        texts: Texts to embed
+        embed_batch: Provider call embedding a list of texts in one request
+        max_batch: Most texts the provider accepts per request, None for no limit
+        task: Embedding task type for models that embed queries and documents
+            differently (part of the cache key), None if the model doesn't
+
+    Returns:
+        One vector per text, in input order
+    """
+    keys = [_embed_cache_key(model, text, task) for text in texts]
+    try:
+        cached = _redis.mget(keys)
+    except redis.RedisError as e:
+        logger.warning(f"Embedding cache unavailable: {e}")
+        return _embed_in_batches(texts, embed_batch, max_batch)
+
+    vectors = [orjson.loads(raw) if raw is not None else None for raw in cached]
+    missing = [i for i, vector in enumerate(vectors) if vector is None]
+    if missing:
+        fresh = _embed_in_batches([texts[i] for i in missing], embed_batch, max_batch)
+        for i, vector in zip(missing, fresh):
+            vectors[i] = vector
+        try:
+            pipe = _redis.pipeline(transaction=False)
+            for i in missing:
+                pipe.set(keys[i], orjson.dumps(vectors[i]), ex=EMBED_CACHE_TTL_SECONDS)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Could not cache embeddings: {e}")
+    return vectors
@@ -1,29 +1,63 @@
 import os
 import time
-import json
+import hashlib
+import orjson
 import redis
 
+# Metrics are published per shard so /ws clients subscribe only to what they show
+METRICS_SHARDS = ("subs", "top3")
+
+
+def metrics_channel(shard: str) -> str:
+    """Pubsub channel carrying updates for one metrics shard"""
+    return f"metrics:{shard}"
+
+
+def metrics_snapshot_key(shard: str) -> str:
+    """Redis key holding the latest update of one metrics shard, for clients that connect later"""
+    return f"metrics:last:{shard}"
+
 
 def main():
     redis_url = os.getenv("REDIS_URL", "redis://redis:6379/0")
-    r = redis.Redis.from_url(redis_url, decode_responses=True)
-    last = None
+    r = redis.Redis.from_url(redis_url)
+    last_hashes = {}
     backoff = 1
     while True:
         # Mock metrics update
-        payload = {
-            "subscribers": 123456,
-            "top3": [
-                {"id": 1, "title": "Sample Video 1", "views": 1200, "likes": 120, "ctr": 4.2},
-                {"id": 2, "title": "Sample Video 2", "views": 2400, "likes": 240, "ctr": 5.1},
-                {"id": 3, "title": "Sample Video 3", "views": 3600, "likes": 360, "ctr": 6.0},
-            ],
-            "last_updated": int(time.time()),
+        shards = {
+            "subs": {"subscribers": 123456},
+            "top3": {
+                "top3": [
+                    {"id": 1, "title": "Sample Video 1", "views": 1200, "likes": 120, "ctr": 4.2},
+                    {"id": 2, "title": "Sample Video 2", "views": 2400, "likes": 240, "ctr": 5.1},
+                    {"id": 3, "title": "Sample Video 3", "views": 3600, "likes": 360, "ctr": 6.0},
+                ],
+            },
         }
-        data = json.dumps(payload)
-        if data != last:
-            r.publish("metrics_updates", data)
-            last = data
+        now = int(time.time())
+        # One round trip for every changed shard: keep its latest snapshot for
+        # late joiners and fan it out. Unchanged shards publish nothing.
+        pipe = r.pipeline(transaction=False)
+        new_hashes = {}
+        for shard, metrics in shards.items():
+            # Hash the metrics without the timestamp - it changes every tick, so
+            # including it would make every payload look new
+            h = hashlib.blake2b(orjson.dumps(metrics, option=orjson.OPT_SORT_KEYS), digest_size=8).digest()
+            if h == last_hashes.get(shard):
+                continue
+            data = orjson.dumps({**metrics, "last_updated": now})
+            pipe.set(metrics_snapshot_key(shard), data)
+            pipe.publish(metrics_channel(shard), data)
+            new_hashes[shard] = h
+        if new_hashes:
+            try:
+                pipe.execute()
+            except redis.RedisError as e:
+                # Hashes stay as they were, so the next tick publishes these shards again
+                print(f"Failed to publish metrics: {e}")
+            else:
+                last_hashes.update(new_hashes)
             backoff = 1
         else:
             backoff = min(backoff * 2, 30)
@@ -32,5 +66,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
-
@@ -1,8 +1,12 @@
 """
 Pattern analyzer for identifying successful video patterns.
 """
-from typing import List, Dict, Optional
-from sqlalchemy.orm import Session
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session, load_only
 from app.models.models import Video, Channel
 from app.services.llm_provider import get_llm_provider
 from app.services.vector_store import get_vector_store
@@ -11,6 +15,72 @@ from collections import Counter
 import re
 
 
+# Title analysis - compiled once rather than per title
+STOP_WORDS = frozenset({"the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for", "of", "with", "by"})
+_WORD_RE = re.compile(r'\b\w+\b')
+_DIGIT_RE = re.compile(r'\d')
+_YEAR_RE = re.compile(r'\b20\d{2}\b')
+
+# Pattern analysis results are cached in Redis for this long; the pipeline
+# worker drops a channel's entries when one of its videos finishes indexing
+PATTERNS_CACHE_TTL_SECONDS = 600
+
+
+def patterns_cache_key(channel_id: int, top_n: int) -> str:
+    """Redis key for a channel's cached pattern analysis"""
+    return f"insights:{channel_id}:{top_n}"
+
+
+@lru_cache(maxsize=1024)
+def _content_themes(titles: Tuple[str, ...]) -> Tuple[str, ...]:
+    """
+    Ask the LLM for the common themes of a set of top video titles.
+
+    Cached per process on the exact titles: a channel's top videos change
+    slowly, so most analyses repeat the previous call. Failures raise and are
+    therefore not cached.
+    """
+    video_summaries = [f"{i}. {title}" for i, title in enumerate(titles, 1)]
+
+    prompt = f"""Analyze these top-performing video titles and identify 3-5 common content themes or topics:
+
+{chr(10).join(video_summaries)}
+
+Return ONLY a JSON array of themes, like this:
+["theme1", "theme2", "theme3"]
+
+Do not include any other text."""
+
+    themes = _parse_json_array(get_llm_provider().generate(prompt))
+    return tuple(themes[:5])  # Limit to 5 themes
+
+
+_json_decoder = json.JSONDecoder()
+
+
+def _parse_json_array(response: str) -> list:
+    """
+    Parse the JSON array in an LLM response.
+
+    Tries the whole response first (the prompt asks for bare JSON), then
+    decodes from the first '[' - raw_decode stops at the matching ']' in one
+    linear scan, so trailing prose is ignored.
+
+    Raises:
+        ValueError: If the response holds no JSON array
+    """
+    try:
+        parsed = json.loads(response)
+    except ValueError:
+        start = response.find("[")
+        if start == -1:
+            raise ValueError("No JSON array in themes response")
+        parsed, _ = _json_decoder.raw_decode(response, start)
+    if not isinstance(parsed, list):
+        raise ValueError("Themes response is not a JSON array")
+    return parsed
+
+
 class PatternAnalyzer:
     """Analyzes top-performing videos to extract success patterns"""
 
@@ -37,50 +107,82 @@ class PatternAnalyzer:
         Returns:
             List of top videos
         """
-        query = db.query(Video).filter(Video.channel_id == channel_id)
+        # Only the columns the analysis reads - skip transcript keys, errors, etc.
+        query = db.query(Video).options(
+            load_only(Video.id, Video.title, Video.duration_seconds, Video.views, Video.likes)
+        ).filter(Video.channel_id == channel_id)
 
         if metric == "views":
             query = query.order_by(Video.views.desc())
         elif metric == "likes":
             query = query.order_by(Video.likes.desc())
         elif metric == "engagement":
-            # Calculate engagement rate: (likes / views) * 100
-            # Order by likes since we can't do complex calculations in SQLAlchemy easily
-            query = query.order_by(Video.likes.desc())
+            # Engagement rate (likes per view); videos with no views sort last
+            engagement_rate = Video.likes * 1.0 / func.nullif(Video.views, 0)
+            query = query.order_by(engagement_rate.desc().nulls_last())
 
         return query.limit(limit).all()
 
-    def analyze_titles(self, videos: List[Video]) -> Dict:
+    def _top_video_stats(self, db: Session, channel_id: int, top_n: int) -> Row:
+        """
+        Engagement and duration aggregates and the titles of a channel's top
+        videos by views, computed by the database in one query (no ORM rows),
+        so every part of the analysis describes the same videos.
+
+        Durations of 0 (not yet known) are left out of the duration aggregates.
+
+        Returns:
+            Row of (videos, total_views, total_likes, avg_duration, min_duration,
+            max_duration, titles) - titles ordered by views
+        """
+        # id breaks ties between equal view counts, so the top N is deterministic
+        top = (
+            select(Video.id, Video.title, Video.views, Video.likes, Video.duration_seconds)
+            .where(Video.channel_id == channel_id)
+            .order_by(Video.views.desc(), Video.id)
+            .limit(top_n)
+            .subquery()
+        )
+        has_duration = top.c.duration_seconds > 0
+        return db.execute(
+            select(
+                func.count().label("videos"),
+                func.coalesce(func.sum(top.c.views), 0).label("total_views"),
+                func.coalesce(func.sum(top.c.likes), 0).label("total_likes"),
+                func.avg(top.c.duration_seconds).filter(has_duration).label("avg_duration"),
+                func.min(top.c.duration_seconds).filter(has_duration).label("min_duration"),
+                func.max(top.c.duration_seconds).filter(has_duration).label("max_duration"),
+                func.array_agg(aggregate_order_by(top.c.title, top.c.views.desc(), top.c.id)).label("titles"),
+            )
+        ).one()
+
+    def analyze_titles(self, titles: List[str]) -> Dict:
         """
         Analyze title patterns in top videos.
 
         Args:
-            videos: List of videos to analyze
+            titles: Titles of the videos to analyze
 
         Returns:
             Title insights
         """
-        titles = [v.title for v in videos]
 
-        # Extract common words (excluding stop words)
-        stop_words = {"the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for", "of", "with", "by"}
-        all_words = []
+        # One pass over the titles: length, keywords (excluding stop words) and patterns
+        word_counts = Counter()
+        patterns = {"how_to": 0, "number_based": 0, "question_based": 0, "year_mentioned": 0}
+        total_length = 0
         for title in titles:
-            words = re.findall(r'\b\w+\b', title.lower())
-            all_words.extend([w for w in words if w not in stop_words and len(w) > 2])
+            total_length += len(title)
+            lowered = title.lower()
+            word_counts.update(w for w in _WORD_RE.findall(lowered) if len(w) > 2 and w not in STOP_WORDS)
+            patterns["how_to"] += "how to" in lowered
+            patterns["number_based"] += _DIGIT_RE.search(title) is not None
+            patterns["question_based"] += "?" in title
+            patterns["year_mentioned"] += _YEAR_RE.search(title) is not None
 
-        word_freq = Counter(all_words).most_common(10)
+        word_freq = word_counts.most_common(10)
 
-        # Calculate average title length
-        avg_length = sum(len(title) for title in titles) / len(titles) if titles else 0
-
-        # Detect common patterns
-        patterns = {
-            "how_to": sum(1 for t in titles if "how to" in t.lower()),
-            "number_based": sum(1 for t in titles if any(char.isdigit() for char in t)),
-            "question_based": sum(1 for t in titles if "?" in t),
-            "year_mentioned": sum(1 for t in titles if re.search(r'\b20\d{2}\b', t)),
-        }
+        avg_length = total_length / len(titles) if titles else 0
 
         return {
             "common_keywords": [{"word": word, "count": count} for word, count in word_freq],
@@ -89,70 +191,49 @@ class PatternAnalyzer:
             "sample_titles": titles[:5]
         }
 
-    def analyze_duration(self, videos: List[Video]) -> Dict:
-        """Analyze video duration patterns"""
-        durations = [v.duration_seconds for v in videos if v.duration_seconds > 0]
-
-        if not durations:
+    def analyze_duration(self, stats: Row) -> Dict:
+        """Analyze video duration patterns from _top_video_stats()"""
+        if stats.avg_duration is None:
             return {"average_seconds": 0, "average_minutes": 0}
 
-        avg_duration = sum(durations) / len(durations)
+        avg_duration = float(stats.avg_duration)
+        min_duration, max_duration = stats.min_duration, stats.max_duration
 
         return {
             "average_seconds": round(avg_duration, 1),
             "average_minutes": round(avg_duration / 60, 1),
-            "min_duration": min(durations),
-            "max_duration": max(durations),
-            "duration_range": f"{round(min(durations)/60, 1)}-{round(max(durations)/60, 1)} min"
+            "min_duration": min_duration,
+            "max_duration": max_duration,
+            "duration_range": f"{round(min_duration/60, 1)}-{round(max_duration/60, 1)} min"
         }
 
-    def analyze_engagement(self, videos: List[Video]) -> Dict:
-        """Analyze engagement metrics"""
-        total_views = sum(v.views for v in videos)
-        total_likes = sum(v.likes for v in videos)
+    def analyze_engagement(self, stats: Row) -> Dict:
+        """Analyze engagement metrics from _top_video_stats()"""
+        count, total_views, total_likes = stats.videos, stats.total_views, stats.total_likes
 
-        avg_views = total_views / len(videos) if videos else 0
-        avg_likes = total_likes / len(videos) if videos else 0
+        avg_views = total_views / count if count else 0
+        avg_likes = total_likes / count if count else 0
         avg_engagement_rate = (total_likes / total_views * 100) if total_views > 0 else 0
 
         return {
             "average_views": round(avg_views),
             "average_likes": round(avg_likes),
             "engagement_rate": round(avg_engagement_rate, 2),
-            "total_videos_analyzed": len(videos)
+            "total_videos_analyzed": count
         }
 
-    def extract_content_themes(self, videos: List[Video]) -> List[str]:
+    def extract_content_themes(self, titles: List[str]) -> List[str]:
         """
         Use LLM to extract common content themes from top videos.
 
         Args:
-            videos: List of videos
+            titles: Titles of the videos, best first
 
         Returns:
             List of content themes
         """
-        # Create a summary of video titles and descriptions
-        video_summaries = []
-        for i, video in enumerate(videos[:5], 1):  # Analyze top 5
-            video_summaries.append(f"{i}. {video.title}")
-
-        prompt = f"""Analyze these top-performing video titles and identify 3-5 common content themes or topics:
-
-{chr(10).join(video_summaries)}
-
-Return ONLY a JSON array of themes, like this:
-["theme1", "theme2", "theme3"]
-
-Do not include any other text."""
-
         try:
-            response = self.llm_provider.generate(prompt)
-            # Extract JSON from response
-            json_match = re.search(r'\[.*\]', response, re.DOTALL)
-            if json_match:
-                themes = json.loads(json_match.group())
-                return themes[:5]  # Limit to 5 themes
+            return list(_content_themes(tuple(titles[:5])))  # Analyze top 5
         except Exception as e:
             print(f"Error extracting themes: {e}")
 
@@ -176,27 +257,29 @@ Do not include any other text."""
         Returns:
             Complete pattern analysis
         """
-        # Get top videos
-        top_videos = self.get_top_videos(db, channel_id, limit=top_n, metric="views")
+        # Numbers are aggregated in SQL; the titles come back in the same row
+        stats = self._top_video_stats(db, channel_id, top_n)
 
-        if not top_videos:
+        if not stats.videos:
             return {
                 "error": "No videos found for analysis",
                 "channel_id": channel_id
             }
 
+        top_titles = stats.titles
+
         # Analyze different aspects
-        title_patterns = self.analyze_titles(top_videos)
-        duration_patterns = self.analyze_duration(top_videos)
-        engagement_patterns = self.analyze_engagement(top_videos)
-        content_themes = self.extract_content_themes(top_videos)
+        title_patterns = self.analyze_titles(top_titles)
+        duration_patterns = self.analyze_duration(stats)
+        engagement_patterns = self.analyze_engagement(stats)
+        content_themes = self.extract_content_themes(top_titles)
 
         # Get channel info
-        channel = db.query(Channel).filter(Channel.id == channel_id).first()
+        channel_name = db.query(Channel.name).filter(Channel.id == channel_id).scalar()
 
         return {
-            "channel_name": channel.name if channel else "Unknown",
-            "videos_analyzed": len(top_videos),
+            "channel_name": channel_name or "Unknown",
+            "videos_analyzed": stats.videos,
             "title_patterns": title_patterns,
             "duration_patterns": duration_patterns,
             "engagement_patterns": engagement_patterns,
@@ -9,119 +9,183 @@ Orchestrates the complete video processing pipeline:
 This worker manages the end-to-end processing flow and updates video status.
 """
 
+import redis
 from celery import chain
 from celery_worker import app as celery_app
+from sqlalchemy import update
 from sqlalchemy.orm import Session
+from app.core.config import get_settings
 from app.db.session import SessionLocal
 from app.models.models import Video, VideoProcessingStatus
 import logging
 
 logger = logging.getLogger(__name__)
 
+_redis = redis.Redis.from_url(get_settings().redis_url)
+
+
+def invalidate_insights_cache(channel_id: int):
+    """
+    Drop a channel's cached pattern analyses, the vector store stats and
+    cached RAG searches, and queue a refresh of its materialized insights.
+    """
+    from app.services.insights_worker import queue_insights_refresh
+    from app.services.pattern_analyzer import patterns_cache_key
+    from app.services.vector_store import SEARCH_GENERATION_KEY, VECTOR_STATS_CACHE_KEY
+
+    # Every indexed video lands here - queue at most one refresh per channel per window
+    queue_insights_refresh(channel_id)
+
+    try:
+        keys = list(_redis.scan_iter(match=patterns_cache_key(channel_id, "*")))
+        _redis.delete(VECTOR_STATS_CACHE_KEY, *keys)
+        # Searches span all channels - start a new generation instead of a SCAN
+        _redis.incr(SEARCH_GENERATION_KEY)
+    except redis.RedisError as e:
+        logger.warning(f"Could not invalidate insights cache for channel {channel_id}: {e}")
+
+
+def _update_video(video_id: int, db: Session | None = None, **values):
+    """
+    Write columns of a video with a single UPDATE (no SELECT first) and commit.
+
+    Uses db when given, otherwise a short-lived session of its own.
+    """
+    if db is not None:
+        db.execute(update(Video).where(Video.id == video_id).values(**values))
+        db.commit()
+        return
+    db = SessionLocal()
+    try:
+        _update_video(video_id, db=db, **values)
+    finally:
+        db.close()
+
 
 def update_video_status(
     video_id: int,
     status: VideoProcessingStatus,
-    error: str | None = None
+    error: str | None = None,
+    db: Session | None = None
 ):
-    """Update video processing status in database"""
-    db = SessionLocal()
+    """Update video processing status in database (in db, if given)"""
+    values = {"processing_status": status}
+    if error:
+        values["processing_error"] = error
     try:
-        video = db.query(Video).filter(Video.id == video_id).first()
-        if video:
-            video.processing_status = status
-            if error:
-                video.processing_error = error
-            db.commit()
-            logger.info(f"Updated video {video_id} status to {status}")
+        _update_video(video_id, db=db, **values)
+        logger.info(f"Updated video {video_id} status to {status}")
     except Exception as e:
         logger.error(f"Failed to update video status: {e}")
-        db.rollback()
+
+
+def _start_video(video_id: int, done_status: VideoProcessingStatus) -> tuple[str | None, str | None]:
+    """
+    Read a video's stored S3 keys and record the status of the first step
+    still to run, in one session: AUDIO_DOWNLOADING without audio, TRANSCRIBING
+    without a transcript, otherwise done_status.
+
+    The session is closed before any step runs - downloads and transcription
+    take minutes and must not hold a pooled connection.
+
+    Returns:
+        (audio_s3_key, transcript_s3_key)
+    """
+    db = SessionLocal()
+    try:
+        video = db.get(Video, video_id)
+        audio_s3_key, transcript_s3_key = (video.audio_s3_key, video.transcript_s3_key) if video else (None, None)
+        if transcript_s3_key:
+            status = done_status
+        elif audio_s3_key:
+            status = VideoProcessingStatus.TRANSCRIBING
+        else:
+            status = VideoProcessingStatus.AUDIO_DOWNLOADING
+        update_video_status(video_id, status, db=db)
     finally:
         db.close()
+    return audio_s3_key, transcript_s3_key
 
 
-@celery_app.task(name="app.services.pipeline_worker.process_video_pipeline")
-def process_video_pipeline(video_id: int, youtube_video_id: str):
+def _download_step(video_id: int, youtube_video_id: str, next_status: VideoProcessingStatus) -> dict:
     """
-    Complete video processing pipeline.
-    Downloads audio, transcribes it, and indexes in vector store.
-
-    Args:
-        video_id: Database video ID
-        youtube_video_id: YouTube video ID (e.g., 'dQw4w9WgXcQ')
+    Download a video's audio and save its S3 key together with next_status.
 
     Returns:
-        dict with processing results
+        dict with success flag and audio_s3_key, or error and failed step
     """
     from app.services.ingest_worker import download_audio
-    from app.services.transcribe_worker import transcribe_audio
-    from app.services.storage_client import StorageClient
-    from app.services.vector_store import VectorStore
-    from app.services.llm_provider import get_provider
-    from datetime import datetime
-    import json
 
-    logger.info(f"Starting video processing pipeline for video {video_id}")
+    logger.info(f"Step 1/3: Downloading audio for video {video_id}")
 
-    try:
-        # Step 1: Download audio
-        update_video_status(video_id, VideoProcessingStatus.AUDIO_DOWNLOADING)
-        logger.info(f"Step 1/3: Downloading audio for video {video_id}")
-
-        audio_result = download_audio(youtube_video_id)
-        if not audio_result.get("success"):
-            error_msg = audio_result.get("error", "Unknown audio download error")
-            logger.error(f"Audio download failed for video {video_id}: {error_msg}")
-            update_video_status(video_id, VideoProcessingStatus.ERROR, error_msg)
-            return {"success": False, "error": error_msg, "step": "audio_download"}
+    audio_result = download_audio(youtube_video_id)
+    if not audio_result.get("success"):
+        error_msg = audio_result.get("error", "Unknown audio download error")
+        logger.error(f"Audio download failed for video {video_id}: {error_msg}")
+        update_video_status(video_id, VideoProcessingStatus.ERROR, error_msg)
+        return {"success": False, "error": error_msg, "step": "audio_download"}
 
-        audio_s3_key = audio_result["s3_key"]
-        logger.info(f"Audio downloaded successfully: {audio_s3_key}")
+    audio_s3_key = audio_result["s3_key"]
+    logger.info(f"Audio downloaded successfully: {audio_s3_key}")
 
-        # Update video with audio_s3_key
-        db = SessionLocal()
-        video = db.query(Video).filter(Video.id == video_id).first()
-        if video:
-            video.audio_s3_key = audio_s3_key
-            video.processing_status = VideoProcessingStatus.AUDIO_DOWNLOADED
-            db.commit()
-        db.close()
+    # Save audio_s3_key together with the next step's status
+    _update_video(video_id, audio_s3_key=audio_s3_key, processing_status=next_status)
+    return {"success": True, "audio_s3_key": audio_s3_key}
 
-        # Step 2: Transcribe audio
-        update_video_status(video_id, VideoProcessingStatus.TRANSCRIBING)
-        logger.info(f"Step 2/3: Transcribing audio for video {video_id}")
 
-        transcribe_result = transcribe_audio(audio_s3_key, youtube_video_id)
-        if not transcribe_result.get("success"):
-            error_msg = transcribe_result.get("error", "Unknown transcription error")
-            logger.error(f"Transcription failed for video {video_id}: {error_msg}")
-            update_video_status(video_id, VideoProcessingStatus.ERROR, error_msg)
-            return {"success": False, "error": error_msg, "step": "transcription"}
+def _transcribe_step(
+    video_id: int,
+    youtube_video_id: str,
+    audio_s3_key: str,
+    done_status: VideoProcessingStatus
+) -> dict:
+    """
+    Transcribe a video's stored audio and save the transcript key together with done_status.
 
-        transcript_s3_key = transcribe_result["transcript_s3_key"]
-        logger.info(f"Transcription completed successfully: {transcript_s3_key}")
+    Returns:
+        dict with success flag and transcript_s3_key, or error and failed step
+    """
+    from app.services.transcribe_worker import transcribe_audio
 
-        # Update video with transcript_s3_key
-        db = SessionLocal()
-        video = db.query(Video).filter(Video.id == video_id).first()
-        if video:
-            video.transcript_s3_key = transcript_s3_key
-            video.processing_status = VideoProcessingStatus.TRANSCRIBED
-            db.commit()
-        db.close()
+    logger.info(f"Step 2/3: Transcribing audio for video {video_id}")
+
+    transcribe_result = transcribe_audio(audio_s3_key, youtube_video_id)
+    if not transcribe_result.get("success"):
+        error_msg = transcribe_result.get("error", "Unknown transcription error")
+        logger.error(f"Transcription failed for video {video_id}: {error_msg}")
+        update_video_status(video_id, VideoProcessingStatus.ERROR, error_msg)
+        return {"success": False, "error": error_msg, "step": "transcription"}
 
-        # Step 3: Index in vector store
-        update_video_status(video_id, VideoProcessingStatus.INDEXING)
-        logger.info(f"Step 3/3: Indexing transcript for video {video_id}")
+    transcript_s3_key = transcribe_result["transcript_s3_key"]
+    logger.info(f"Transcription completed successfully: {transcript_s3_key}")
 
-        # Fetch transcript from storage
-        storage = StorageClient()
-        transcript_json = storage.get_object(transcript_s3_key)
-        transcript_data = json.loads(transcript_json)
+    # Save transcript_s3_key together with the final status
+    _update_video(video_id, transcript_s3_key=transcript_s3_key, processing_status=done_status)
+    return {"success": True, "transcript_s3_key": transcript_s3_key}
 
-        # Get video details for metadata
-        db = SessionLocal()
+
+def _index_step(video_id: int, transcript_s3_key: str) -> int:
+    """
+    Index a video's stored transcript in the vector store and mark the video COMPLETE.
+
+    Returns:
+        Number of chunks indexed
+    """
+    from app.services.storage_client import get_storage_client
+    from app.services.vector_store import get_vector_store
+    from datetime import datetime
+    import orjson
+
+    logger.info(f"Step 3/3: Indexing transcript for video {video_id}")
+
+    # Fetch transcript from storage
+    storage = get_storage_client()
+    transcript_json = storage.get_object(transcript_s3_key)
+    transcript_data = orjson.loads(transcript_json)
+
+    # Get video details for metadata
+    db = SessionLocal()
+    try:
         video = db.query(Video).filter(Video.id == video_id).first()
         if not video:
             raise Exception(f"Video {video_id} not found in database")
@@ -135,8 +199,7 @@ def process_video_pipeline(video_id: int, youtube_video_id: str):
         }
 
         # Index in ChromaDB
-        llm_provider = get_provider()
-        vector_store = VectorStore(llm_provider)
+        vector_store = get_vector_store()
 
         chunks_indexed = vector_store.index_transcript(
             video_id=str(video.id),
@@ -148,24 +211,307 @@ def process_video_pipeline(video_id: int, youtube_video_id: str):
         logger.info(f"Successfully indexed {chunks_indexed} chunks for video {video_id}")
 
         # Mark as complete
+        channel_id = video.channel_id
         video.processing_status = VideoProcessingStatus.COMPLETE
         video.indexed_at = datetime.utcnow()
         db.commit()
+    finally:
         db.close()
 
-        return {
-            "success": True,
-            "video_id": video_id,
-            "audio_s3_key": audio_s3_key,
-            "transcript_s3_key": transcript_s3_key,
-            "chunks_indexed": chunks_indexed
-        }
+    # New transcript chunks change the channel's patterns and the index size
+    invalidate_insights_cache(channel_id)
+    return chunks_indexed
+
+
+def _ensure_transcript(
+    video_id: int,
+    youtube_video_id: str,
+    done_status: VideoProcessingStatus = VideoProcessingStatus.TRANSCRIBED
+) -> dict:
+    """
+    Download and transcribe a video, skipping steps whose output is already stored.
+
+    Runs the ingest and transcribe tasks inline (in this worker). Each step's
+    S3 key is saved in the same UPDATE as the status of whatever comes next,
+    so no step costs a separate status write.
+
+    Args:
+        video_id: Database video ID
+        youtube_video_id: YouTube video ID
+        done_status: Status to record once the transcript is stored
 
+    Returns:
+        dict with success flag and audio/transcript S3 keys, or error and failed step
+    """
+    audio_s3_key, transcript_s3_key = _start_video(video_id, done_status)
+    if transcript_s3_key:
+        return {"success": True, "audio_s3_key": audio_s3_key, "transcript_s3_key": transcript_s3_key}
+
+    # Step 1: Download audio
+    if not audio_s3_key:
+        result = _download_step(video_id, youtube_video_id, VideoProcessingStatus.TRANSCRIBING)
+        if not result["success"]:
+            return result
+        audio_s3_key = result["audio_s3_key"]
+
+    # Step 2: Transcribe audio
+    result = _transcribe_step(video_id, youtube_video_id, audio_s3_key, done_status)
+    if not result["success"]:
+        return result
+
+    return {"success": True, "audio_s3_key": audio_s3_key, "transcript_s3_key": result["transcript_s3_key"]}
+
+
+@celery_app.task(name="app.services.pipeline_worker.transcribe_video")
+def transcribe_video(video_id: int, youtube_video_id: str):
+    """
+    Download (if needed) and transcribe a video, without indexing it.
+
+    Args:
+        video_id: Database video ID
+        youtube_video_id: YouTube video ID
+
+    Returns:
+        dict with success flag and audio/transcript S3 keys
+    """
+    logger.info(f"Starting transcription for video {video_id}")
+    try:
+        result = _ensure_transcript(video_id, youtube_video_id)
     except Exception as e:
         error_msg = str(e)
-        logger.error(f"Pipeline failed for video {video_id}: {error_msg}")
+        logger.error(f"Transcription failed for video {video_id}: {error_msg}")
         update_video_status(video_id, VideoProcessingStatus.ERROR, error_msg)
         return {"success": False, "error": error_msg, "step": "unknown"}
+    return {"video_id": video_id, **result}
+
+
+# Each pipeline stage retries unexpected errors (S3, DB, Chroma hiccups) this
+# many times, backing off 10s, 20s, 40s, before marking the video ERROR
+PIPELINE_STAGE_RETRIES = 3
+
+
+def _retry_or_fail(task, state: dict, step: str, exc: Exception) -> dict:
+    """Retry a pipeline stage, or once retries are used up record the failure"""
+    if task.request.retries < task.max_retries:
+        raise task.retry(exc=exc, countdown=10 * 2 ** task.request.retries)
+    error_msg = str(exc)
+    logger.error(f"Pipeline failed for video {state['video_id']} at {step}: {error_msg}")
+    update_video_status(state["video_id"], VideoProcessingStatus.ERROR, error_msg)
+    # Returned rather than raised, so later stages pass it through and the
+    # chain's final result reports the failure
+    return {**state, "success": False, "error": error_msg, "step": step}
+
+
+@celery_app.task(
+    bind=True,
+    max_retries=PIPELINE_STAGE_RETRIES,
+    name="app.services.pipeline_worker.pipeline_download_stage",
+)
+def pipeline_download_stage(self, video_id: int, youtube_video_id: str) -> dict:
+    """
+    Pipeline stage 1: download the audio unless a transcript or audio is already stored.
+
+    Returns:
+        Pipeline state dict passed to the next stage
+    """
+    state = {"success": True, "video_id": video_id, "youtube_video_id": youtube_video_id}
+    try:
+        audio_s3_key, transcript_s3_key = _start_video(video_id, VideoProcessingStatus.INDEXING)
+        state.update(audio_s3_key=audio_s3_key, transcript_s3_key=transcript_s3_key)
+        if not audio_s3_key and not transcript_s3_key:
+            result = _download_step(video_id, youtube_video_id, VideoProcessingStatus.TRANSCRIBING)
+            state.update(result)
+    except Exception as e:
+        return _retry_or_fail(self, state, "audio_download", e)
+    return state
+
+
+@celery_app.task(
+    bind=True,
+    max_retries=PIPELINE_STAGE_RETRIES,
+    name="app.services.pipeline_worker.pipeline_transcribe_stage",
+)
+def pipeline_transcribe_stage(self, state: dict) -> dict:
+    """
+    Pipeline stage 2: transcribe the audio unless a transcript is already stored.
+
+    Returns:
+        Pipeline state dict passed to the next stage
+    """
+    if not state["success"] or state.get("transcript_s3_key"):
+        return state
+    try:
+        result = _transcribe_step(
+            state["video_id"], state["youtube_video_id"], state["audio_s3_key"], VideoProcessingStatus.INDEXING
+        )
+    except Exception as e:
+        return _retry_or_fail(self, state, "transcription", e)
+    return {**state, **result}
+
+
+@celery_app.task(
+    bind=True,
+    max_retries=PIPELINE_STAGE_RETRIES,
+    name="app.services.pipeline_worker.pipeline_index_stage",
+)
+def pipeline_index_stage(self, state: dict) -> dict:
+    """
+    Pipeline stage 3: index the transcript in the vector store.
+
+    Returns:
+        dict with processing results
+    """
+    if not state["success"]:
+        return state
+    try:
+        chunks_indexed = _index_step(state["video_id"], state["transcript_s3_key"])
+    except Exception as e:
+        return _retry_or_fail(self, state, "vector_index", e)
+    return {
+        "success": True,
+        "video_id": state["video_id"],
+        "audio_s3_key": state.get("audio_s3_key"),
+        "transcript_s3_key": state["transcript_s3_key"],
+        "chunks_indexed": chunks_indexed
+    }
+
+
+def video_pipeline(video_id: int, youtube_video_id: str):
+    """
+    The complete video processing pipeline as a Celery chain:
+    download audio -> transcribe -> index in vector store.
+
+    Each stage runs on its own queue, so a slow transcription holds a
+    transcribe slot rather than an ingest slot, and a failed stage retries
+    without redoing earlier ones. The chain's result (its last task) is the
+    pipeline result.
+
+    Args:
+        video_id: Database video ID
+        youtube_video_id: YouTube video ID (e.g., 'dQw4w9WgXcQ')
+    """
+    return chain(
+        pipeline_download_stage.s(video_id, youtube_video_id).set(queue="ingest"),
+        pipeline_transcribe_stage.s().set(queue="transcribe"),
+        pipeline_index_stage.s().set(queue="embedding"),
+    )
+
+
+@celery_app.task(name="app.services.pipeline_worker.process_video_pipeline")
+def process_video_pipeline(video_id: int, youtube_video_id: str):
+    """
+    Start the complete video processing pipeline (see video_pipeline).
+
+    Args:
+        video_id: Database video ID
+        youtube_video_id: YouTube video ID (e.g., 'dQw4w9WgXcQ')
+
+    Returns:
+        dict with the pipeline's final task ID
+    """
+    logger.info(f"Starting video processing pipeline for video {video_id}")
+    result = video_pipeline(video_id, youtube_video_id).apply_async()
+    return {"success": True, "video_id": video_id, "pipeline_task_id": result.id}
+
+
+# Parallel S3 reads when batch-indexing a channel's transcripts
+TRANSCRIPT_FETCH_WORKERS = 8
+
+
+@celery_app.task(name="app.services.pipeline_worker.index_channel_transcripts")
+def index_channel_transcripts(channel_id: int):
+    """
+    Index every transcribed but not yet indexed video of a channel in one batch.
+
+    Transcripts are fetched in parallel and their chunks share embedding calls,
+    instead of one pipeline run (and embedding pass) per video.
+
+    Args:
+        channel_id: Database channel ID
+
+    Returns:
+        dict with the number of videos and chunks indexed
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from app.services.storage_client import get_storage_client
+    from app.services.vector_store import get_vector_store
+    from datetime import datetime
+    import orjson
+
+    logger.info(f"Starting batch indexing for channel {channel_id}")
+
+    db = SessionLocal()
+    video_ids = []
+    try:
+        videos = db.query(Video).filter(
+            Video.channel_id == channel_id,
+            Video.transcript_s3_key.isnot(None),
+            Video.indexed_at.is_(None)
+        ).all()
+        video_ids = [v.id for v in videos]
+        if not videos:
+            return {"success": True, "channel_id": channel_id, "videos_indexed": 0, "chunks_indexed": 0}
+
+        # Snapshot what indexing needs before the status commit expires the rows
+        pending = [
+            {
+                "video_id": str(v.id),
+                "youtube_video_id": v.youtube_video_id,
+                "s3_key": v.transcript_s3_key,
+                "metadata": {
+                    "views": v.views,
+                    "likes": v.likes,
+                    "title": v.title,
+                    "duration": v.duration_seconds
+                }
+            }
+            for v in videos
+        ]
+        for video in videos:
+            video.processing_status = VideoProcessingStatus.INDEXING
+        db.commit()
+
+        storage = get_storage_client()
+        with ThreadPoolExecutor(max_workers=TRANSCRIPT_FETCH_WORKERS) as pool:
+            raw_transcripts = list(pool.map(storage.get_object, [item.pop("s3_key") for item in pending]))
+        for item, raw in zip(pending, raw_transcripts):
+            item["transcript_data"] = orjson.loads(raw)
+
+        # Empty transcripts can't be chunked - don't let one fail the whole batch
+        empty_ids = {item["video_id"] for item in pending if not item["transcript_data"].get("text")}
+        chunk_counts = get_vector_store().index_transcripts(
+            [item for item in pending if item["video_id"] not in empty_ids]
+        )
+
+        indexed_at = datetime.utcnow()
+        for video in videos:
+            if str(video.id) in empty_ids:
+                video.processing_status = VideoProcessingStatus.ERROR
+                video.processing_error = "Transcript text is empty"
+            else:
+                video.processing_status = VideoProcessingStatus.COMPLETE
+                video.indexed_at = indexed_at
+        db.commit()
+    except Exception as e:
+        error_msg = str(e)
+        logger.error(f"Batch indexing failed for channel {channel_id}: {error_msg}")
+        db.rollback()
+        for video_id in video_ids:
+            update_video_status(video_id, VideoProcessingStatus.ERROR, error_msg)
+        return {"success": False, "error": error_msg, "step": "vector_index"}
+    finally:
+        db.close()
+
+    invalidate_insights_cache(channel_id)
+
+    chunks_indexed = sum(chunk_counts.values())
+    logger.info(f"Indexed {chunks_indexed} chunks from {len(chunk_counts)} videos for channel {channel_id}")
+    return {
+        "success": True,
+        "channel_id": channel_id,
+        "videos_indexed": len(chunk_counts),
+        "chunks_indexed": chunks_indexed
+    }
 
 
 @celery_app.task(name="app.services.pipeline_worker.queue_video_processing")
@@ -179,5 +525,5 @@ def queue_video_processing(video_id: int, youtube_video_id: str):
         youtube_video_id: YouTube video ID
     """
     logger.info(f"Queueing video {video_id} ({youtube_video_id}) for processing")
-    process_video_pipeline.delay(video_id, youtube_video_id)
+    video_pipeline(video_id, youtube_video_id).apply_async()
     return {"success": True, "video_id": video_id, "status": "queued"}
@@ -1,6 +1,9 @@
 import os
 import google.generativeai as genai
-from app.services.llm_provider import LLMProvider
+from app.services.llm_provider import EMBEDDING_MODEL, LLMProvider, cached_embed
+
+# batchEmbedContents rejects requests with more texts than this
+GEMINI_MAX_EMBED_BATCH = 100
 
 
 class GeminiProvider(LLMProvider):
@@ -10,12 +13,27 @@ class GeminiProvider(LLMProvider):
             genai.configure(api_key=api_key)
         self.model = genai.GenerativeModel("gemini-1.5-flash") if api_key else None
 
-    def embed(self, texts: list[str]) -> list[list[float]]:
+    def embed(self, texts: list[str], is_query: bool = False) -> list[list[float]]:
         # Minimal mock embeddings if not configured
         if not self.model:
             return [[0.0 for _ in range(8)] for _ in texts]
-        # Placeholder: use simple text lengths as embeddings to avoid heavy API calls here
-        return [[float(len(t))] * 8 for t in texts]
+        if not EMBEDDING_MODEL:
+            # Placeholder: use simple text lengths as embeddings to avoid heavy API calls here
+            return [[float(len(t))] * 8 for t in texts]
+        # Gemini embeds search queries and indexed documents differently
+        task_type = "retrieval_query" if is_query else "retrieval_document"
+        return cached_embed(
+            EMBEDDING_MODEL,
+            texts,
+            lambda batch: self._embed_batch(batch, task_type),
+            max_batch=GEMINI_MAX_EMBED_BATCH,
+            task=task_type,
+        )
+
+    def _embed_batch(self, texts: list[str], task_type: str) -> list[list[float]]:
+        # embed_content takes the whole list in one request
+        result = genai.embed_content(model=EMBEDDING_MODEL, content=texts, task_type=task_type)
+        return result["embedding"]
 
     def generate(self, prompt: str, **kwargs) -> str:
         if not self.model:
@@ -1,6 +1,6 @@
 import os
 from openai import OpenAI
-from app.services.llm_provider import LLMProvider
+from app.services.llm_provider import EMBEDDING_MODEL, LLMProvider, cached_embed
 
 
 class OpenAIProvider(LLMProvider):
@@ -8,11 +8,18 @@ class OpenAIProvider(LLMProvider):
         api_key = os.getenv("OPENAI_API_KEY")
         self.client = OpenAI(api_key=api_key) if api_key else None
 
-    def embed(self, texts: list[str]) -> list[list[float]]:
+    def embed(self, texts: list[str], is_query: bool = False) -> list[list[float]]:
         if not self.client:
             return [[0.0 for _ in range(8)] for _ in texts]
-        # Placeholder: real implementation would call embeddings
-        return [[float(len(t))] * 8 for t in texts]
+        if not EMBEDDING_MODEL:
+            # Placeholder: use simple text lengths as embeddings to avoid heavy API calls here
+            return [[float(len(t))] * 8 for t in texts]
+        return cached_embed(EMBEDDING_MODEL, texts, self._embed_batch)
+
+    def _embed_batch(self, texts: list[str]) -> list[list[float]]:
+        # One request for the whole batch; results come back in input order
+        resp = self.client.embeddings.create(model=EMBEDDING_MODEL, input=texts)
+        return [d.embedding for d in resp.data]
 
     def generate(self, prompt: str, **kwargs) -> str:
         if not self.client:
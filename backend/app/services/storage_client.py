@@ -4,6 +4,7 @@ Automatically switches based on STORAGE_TYPE environment variable.
 """
 import os
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
 from io import BytesIO
 from typing import Optional
@@ -11,6 +12,14 @@ from app.core.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Files above 8 MB (audio) go up/down as 5 MB parts, several at a time,
+# streamed from/to disk rather than buffered whole in memory
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=5 * 1024 * 1024,
+    max_concurrency=8,
+)
+
 
 class StorageClient:
     """
@@ -130,7 +139,9 @@ class StorageClient:
         """
         try:
             extra_args = {'ContentType': content_type}
-            self.s3_client.upload_file(file_path, self.bucket_name, object_name, ExtraArgs=extra_args)
+            self.s3_client.upload_file(
+                file_path, self.bucket_name, object_name, ExtraArgs=extra_args, Config=TRANSFER_CONFIG
+            )
             logger.info(f"Uploaded file: {file_path} → s3://{self.bucket_name}/{object_name}")
             return object_name
         except ClientError as e:
@@ -174,7 +185,7 @@ class StorageClient:
             Local file path
         """
         try:
-            self.s3_client.download_file(self.bucket_name, object_name, file_path)
+            self.s3_client.download_file(self.bucket_name, object_name, file_path, Config=TRANSFER_CONFIG)
             logger.info(f"Downloaded file: s3://{self.bucket_name}/{object_name} → {file_path}")
             return file_path
         except ClientError as e:
@@ -8,6 +8,10 @@ from sqlalchemy.orm import Session
 import json
 import re
 
+# Title scoring checks - compiled once rather than per scored title
+_DIGIT_RE = re.compile(r'\d')
+_YEAR_RE = re.compile(r'\b20\d{2}\b')
+
 
 class TitleOptimizer:
     """Generates and optimizes video titles based on performance data"""
@@ -59,7 +63,7 @@ class TitleOptimizer:
             score += 10
             factors.append({"factor": "'How to' format (proven performer)", "points": 10})
 
-        if any(char.isdigit() for char in title) and title_patterns.get("number_based", 0) > 3:
+        if _DIGIT_RE.search(title) and title_patterns.get("number_based", 0) > 3:
             score += 8
             factors.append({"factor": "Number-based (increases CTR)", "points": 8})
 
@@ -68,7 +72,7 @@ class TitleOptimizer:
             factors.append({"factor": "Question format (curiosity driver)", "points": 7})
 
         # Year mention
-        if re.search(r'\b20\d{2}\b', title):
+        if _YEAR_RE.search(title):
             score += 5
             factors.append({"factor": "Includes current/relevant year", "points": 5})
 
@@ -0,0 +1,69 @@
+"""
+Google Token Refresh Worker
+
+Refreshes users' Google access tokens shortly before they expire, so API
+requests find a valid stored token instead of refreshing on the critical path.
+"""
+
+import redis
+from celery_worker import app as celery_app
+from app.core.config import get_settings
+from app.db.session import SessionLocal
+from app.models.models import User
+from app.services import google_api, google_tokens
+import logging
+
+logger = logging.getLogger(__name__)
+
+_redis = redis.Redis.from_url(get_settings().redis_url)
+
+
+@celery_app.task(name="app.services.token_worker.refresh_google_token")
+def refresh_google_token(user_id: int):
+    """
+    Proactively refresh a user's Google access token.
+
+    Args:
+        user_id: Database user ID
+    """
+    db = SessionLocal()
+    try:
+        user = db.get(User, user_id)
+        if not user or not user.google_refresh_token:
+            return {"success": False, "user_id": user_id, "reason": "no refresh token"}
+
+        with _redis.lock(
+            google_tokens.refresh_lock_name(user_id),
+            timeout=google_tokens.REFRESH_LOCK_TIMEOUT,
+            blocking_timeout=google_tokens.REFRESH_LOCK_WAIT,
+        ):
+            db.refresh(user)
+            # Already renewed by a request or an earlier task
+            if google_tokens.has_valid_token(user, margin=2 * google_tokens.PROACTIVE_REFRESH_LEAD):
+                return {"success": True, "user_id": user_id, "status": "fresh"}
+
+            token_response = google_api.refresh_access_token_sync(user.google_refresh_token)
+            google_tokens.store_token_response(user, token_response)
+            db.commit()
+
+        logger.info(f"Proactively refreshed Google token for user {user_id}")
+
+        # Schedule the next refresh too - the request path only refreshes within
+        # REFRESH_MARGIN of expiry, so it would otherwise pay for every other one.
+        # Users idle for ACTIVE_USER_WINDOW drop out of the cycle.
+        try:
+            active = _redis.exists(google_tokens.active_user_key(user_id))
+        except redis.RedisError as e:
+            logger.warning(f"Could not check activity of user {user_id}: {e}")
+            active = False
+        if active:
+            refresh_google_token.apply_async(
+                args=[user_id], eta=user.google_token_expiry - google_tokens.PROACTIVE_REFRESH_LEAD
+            )
+        return {"success": True, "user_id": user_id, "status": "refreshed", "rescheduled": bool(active)}
+    except Exception as e:
+        logger.warning(f"Proactive token refresh failed for user {user_id}: {e}")
+        db.rollback()
+        return {"success": False, "user_id": user_id, "error": str(e)}
+    finally:
+        db.close()
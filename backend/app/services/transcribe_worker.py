@@ -8,7 +8,7 @@ import time
 from openai import OpenAI
 from app.services.storage_client import get_storage_client
 from app.core.logging_config import get_logger
-import json
+import orjson
 
 logger = get_logger(__name__)
 
@@ -34,10 +34,14 @@ def transcribe_audio(s3_key: str, video_id: str) -> dict:
         logger.info(f"Downloading audio from storage: {s3_key}")
         start_time = time.time()
         with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as temp_audio:
-            audio_data = storage_client.get_object(s3_key)
-            temp_audio.write(audio_data)
             temp_audio_path = temp_audio.name
-            file_size_mb = len(audio_data) / (1024 * 1024)
+        # Stream straight to disk (ranged multipart GET) - the audio never sits in memory
+        try:
+            storage_client.download_file(s3_key, temp_audio_path)
+        except Exception:
+            os.unlink(temp_audio_path)
+            raise
+        file_size_mb = os.path.getsize(temp_audio_path) / (1024 * 1024)
 
         download_duration = time.time() - start_time
         logger.info(f"Audio downloaded ({file_size_mb:.2f} MB) in {download_duration:.2f}s")
@@ -81,7 +85,8 @@ def transcribe_audio(s3_key: str, video_id: str) -> dict:
 
             # Upload transcript to MinIO
             transcript_s3_key = f"transcripts/{video_id}.json"
-            transcript_json = json.dumps(transcript_data, indent=2).encode('utf-8')
+            # Compact JSON - every reader parses it, nobody reads it by eye
+            transcript_json = orjson.dumps(transcript_data)
             transcript_size_kb = len(transcript_json) / 1024
 
             logger.info(f"Uploading transcript to storage: {transcript_s3_key} ({transcript_size_kb:.2f} KB)")
@@ -2,15 +2,32 @@
 ChromaDB vector store for semantic search of video transcripts.
 """
 import os
+import hashlib
 import chromadb
 from chromadb.config import Settings
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import json
 from app.services.llm_provider import get_llm_provider
 from app.core.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Redis key for the cached get_collection_stats() result in channel insights
+VECTOR_STATS_CACHE_KEY = "insights:vector_stats"
+
+# Chunks per embedding call (and per Chroma add) when indexing
+EMBED_BATCH_SIZE = 128
+
+# Cached search() results for RAG context. Keys embed the current value of
+# SEARCH_GENERATION_KEY, which indexing bumps, so new transcripts retire them
+SEARCH_CACHE_TTL_SECONDS = 3600
+SEARCH_GENERATION_KEY = "rag:generation"
+
+
+def search_cache_key(generation: int, query: str, n_results: int) -> str:
+    """Redis key for a cached search() result"""
+    return f"rag:{generation}:{hashlib.sha1(query.encode()).hexdigest()}:{n_results}"
+
 
 class VectorStore:
     """Vector store for indexing and searching video transcripts"""
@@ -29,10 +46,13 @@ class VectorStore:
                 settings=Settings(anonymized_telemetry=False)
             )
 
-            # Get or create collection for transcripts
+            # Get or create collection for transcripts. Embeddings always come from
+            # llm_provider, so no Chroma-side embedding function (its default would
+            # load a local ONNX model and embed any add/query missing embeddings)
             self.collection = self.client.get_or_create_collection(
                 name="video_transcripts",
-                metadata={"description": "YouTube video transcripts with metadata"}
+                metadata={"description": "YouTube video transcripts with metadata"},
+                embedding_function=None
             )
 
             collection_count = self.collection.count()
@@ -80,6 +100,79 @@ class VectorStore:
         logger.debug(f"Transcript chunked into {len(chunks)} segments")
         return chunks
 
+    def _chunk_records(
+        self,
+        video_id: str,
+        youtube_video_id: str,
+        transcript_data: Dict,
+        metadata: Optional[Dict] = None
+    ) -> Tuple[List[str], List[str], List[Dict]]:
+        """
+        Chunk a transcript into Chroma records.
+
+        Returns:
+            Parallel lists of chunk IDs, chunk texts and chunk metadata
+        """
+        transcript_text = transcript_data.get("text", "")
+
+        if not transcript_text:
+            logger.error(f"Transcript text is empty for video {youtube_video_id}")
+            raise ValueError("Transcript text is empty")
+
+        # Chunk the transcript
+        chunks = self.chunk_transcript(transcript_text)
+        logger.info(f"Generated {len(chunks)} chunks for video {youtube_video_id}")
+
+        # Prepare metadata for each chunk
+        chunk_ids = []
+        chunk_metadatas = []
+
+        for i, chunk in enumerate(chunks):
+            chunk_id = f"{youtube_video_id}_chunk_{i}"
+            chunk_ids.append(chunk_id)
+
+            chunk_metadata = {
+                "video_id": str(video_id),
+                "youtube_video_id": youtube_video_id,
+                "chunk_index": i,
+                "total_chunks": len(chunks),
+                "language": transcript_data.get("language", "unknown"),
+            }
+
+            # Add optional metadata
+            if metadata:
+                chunk_metadata.update({
+                    "views": metadata.get("views", 0),
+                    "likes": metadata.get("likes", 0),
+                    "title": metadata.get("title", "")[:100],  # Truncate long titles
+                    "duration": metadata.get("duration", 0),
+                })
+
+            chunk_metadatas.append(chunk_metadata)
+
+        return chunk_ids, chunks, chunk_metadatas
+
+    def _add_records(self, chunk_ids: List[str], chunks: List[str], chunk_metadatas: List[Dict]):
+        """
+        Embed chunks and add them to the collection, EMBED_BATCH_SIZE chunks per call.
+
+        Chunks are batched in length order so each embedding call gets
+        similar-length inputs (less padding for the model). Each record carries
+        its own ID, so the collection doesn't care about the order.
+        """
+        by_length = sorted(range(len(chunks)), key=lambda i: len(chunks[i]))
+        for start in range(0, len(by_length), EMBED_BATCH_SIZE):
+            batch = by_length[start:start + EMBED_BATCH_SIZE]
+            batch_chunks = [chunks[i] for i in batch]
+            logger.debug(f"Generating embeddings for {len(batch)} chunks ({start + len(batch)}/{len(chunks)})")
+            embeddings = self.llm_provider.embed(batch_chunks)
+            self.collection.add(
+                ids=[chunk_ids[i] for i in batch],
+                embeddings=embeddings,
+                documents=batch_chunks,
+                metadatas=[chunk_metadatas[i] for i in batch]
+            )
+
     def index_transcript(
         self,
         video_id: str,
@@ -101,57 +194,14 @@ class VectorStore:
         """
         logger.info(f"Indexing transcript for video {youtube_video_id} (db_id: {video_id})")
 
-        transcript_text = transcript_data.get("text", "")
-
-        if not transcript_text:
-            logger.error(f"Transcript text is empty for video {youtube_video_id}")
-            raise ValueError("Transcript text is empty")
-
         try:
-            # Chunk the transcript
-            chunks = self.chunk_transcript(transcript_text)
-            logger.info(f"Generated {len(chunks)} chunks for video {youtube_video_id}")
-
-            # Generate embeddings
-            logger.debug(f"Generating embeddings for {len(chunks)} chunks")
-            embeddings = self.llm_provider.embed(chunks)
-            logger.debug(f"Embeddings generated successfully")
-
-            # Prepare metadata for each chunk
-            chunk_ids = []
-            chunk_metadatas = []
-
-            for i, chunk in enumerate(chunks):
-                chunk_id = f"{youtube_video_id}_chunk_{i}"
-                chunk_ids.append(chunk_id)
-
-                chunk_metadata = {
-                    "video_id": str(video_id),
-                    "youtube_video_id": youtube_video_id,
-                    "chunk_index": i,
-                    "total_chunks": len(chunks),
-                    "language": transcript_data.get("language", "unknown"),
-                }
-
-                # Add optional metadata
-                if metadata:
-                    chunk_metadata.update({
-                        "views": metadata.get("views", 0),
-                        "likes": metadata.get("likes", 0),
-                        "title": metadata.get("title", "")[:100],  # Truncate long titles
-                        "duration": metadata.get("duration", 0),
-                    })
-
-                chunk_metadatas.append(chunk_metadata)
+            chunk_ids, chunks, chunk_metadatas = self._chunk_records(
+                video_id, youtube_video_id, transcript_data, metadata
+            )
 
-            # Add to ChromaDB
+            # Embed and add to ChromaDB
             logger.debug(f"Adding {len(chunks)} chunks to ChromaDB collection")
-            self.collection.add(
-                ids=chunk_ids,
-                embeddings=embeddings,
-                documents=chunks,
-                metadatas=chunk_metadatas
-            )
+            self._add_records(chunk_ids, chunks, chunk_metadatas)
 
             logger.info(
                 f"Successfully indexed {len(chunks)} chunks for video {youtube_video_id} "
@@ -163,6 +213,43 @@ class VectorStore:
             logger.error(f"Error indexing transcript for video {youtube_video_id}: {e}", exc_info=True)
             raise
 
+    def index_transcripts(self, transcripts: List[Dict]) -> Dict[str, int]:
+        """
+        Index several videos' transcripts with shared embedding calls.
+
+        Chunks from all videos are pooled, so a channel re-index makes
+        ceil(total_chunks / EMBED_BATCH_SIZE) embedding calls instead of at
+        least one per video.
+
+        Args:
+            transcripts: Dicts with the index_transcript arguments
+                (video_id, youtube_video_id, transcript_data, metadata)
+
+        Returns:
+            Number of chunks indexed per video_id
+        """
+        logger.info(f"Batch indexing {len(transcripts)} transcripts")
+
+        all_ids, all_chunks, all_metadatas = [], [], []
+        chunk_counts = {}
+        for item in transcripts:
+            chunk_ids, chunks, chunk_metadatas = self._chunk_records(
+                item["video_id"], item["youtube_video_id"], item["transcript_data"], item.get("metadata")
+            )
+            all_ids.extend(chunk_ids)
+            all_chunks.extend(chunks)
+            all_metadatas.extend(chunk_metadatas)
+            chunk_counts[str(item["video_id"])] = len(chunks)
+
+        try:
+            self._add_records(all_ids, all_chunks, all_metadatas)
+        except Exception as e:
+            logger.error(f"Error batch indexing {len(transcripts)} transcripts: {e}", exc_info=True)
+            raise
+
+        logger.info(f"Successfully indexed {len(all_chunks)} chunks across {len(transcripts)} videos")
+        return chunk_counts
+
     def search(
         self,
         query: str,
@@ -185,7 +272,7 @@ class VectorStore:
         try:
             # Generate query embedding
             logger.debug("Generating query embedding")
-            query_embedding = self.llm_provider.embed([query])[0]
+            query_embedding = self.llm_provider.embed([query], is_query=True)[0]
 
             # Search ChromaDB
             logger.debug("Querying ChromaDB collection")
@@ -1,13 +1,26 @@
-from googleapiclient.discovery import build
+from functools import lru_cache
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
 from google.oauth2.credentials import Credentials
 from datetime import datetime
 import isodate
-from typing import Optional
+from typing import Iterator, Optional
 from app.core.logging_config import get_logger
 
 logger = get_logger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _discovery_doc(service_name: str, version: str) -> str:
+    """Load the discovery document shipped with googleapiclient once per process"""
+    return get_static_doc(service_name, version)
+
+
+def warm_discovery_cache() -> None:
+    """Preload the YouTube discovery document so the first client build is free"""
+    _discovery_doc("youtube", "v3")
+
+
 class YouTubeClient:
     """Client for interacting with YouTube Data API v3"""
 
@@ -17,7 +30,11 @@ class YouTubeClient:
         If credentials are provided, API quota will be charged to the authenticated user.
         """
         self.credentials = credentials
-        self.youtube = build("youtube", "v3", credentials=credentials) if credentials else None
+        # Build from the cached discovery doc - no network fetch or JSON file read per client
+        self.youtube = (
+            build_from_document(_discovery_doc("youtube", "v3"), credentials=credentials)
+            if credentials else None
+        )
         logger.info(f"YouTubeClient initialized (authenticated: {credentials is not None})")
 
     def fetch_channel_metadata(self, channel_url_or_id: str) -> dict:
@@ -76,81 +93,153 @@ class YouTubeClient:
 
         Args:
             channel_id: YouTube channel ID
-            limit: Maximum number of videos to fetch (default: 50, max: 50 per request)
+            limit: Maximum number of videos to fetch (default: 50)
             order: Sort order - 'date', 'viewCount', 'rating' (default: 'date')
 
         Returns:
             List of video dictionaries with metadata
         """
+        videos = [video for page in self.iter_video_pages(channel_id, limit, order) for video in page]
+
+        total_views = sum(v["views"] for v in videos)
+        logger.info(
+            f"Fetched {len(videos)} videos for channel {channel_id} - "
+            f"Total views: {total_views:,}"
+        )
+        return videos
+
+    def get_uploads_playlist_id(self, channel_id: str) -> Optional[str]:
+        """
+        Look up the playlist holding all of a channel's uploads.
+
+        Args:
+            channel_id: YouTube channel ID
+
+        Returns:
+            Uploads playlist ID, or None if the channel wasn't found
+        """
         if not self.youtube:
-            logger.error("Attempted to fetch videos without credentials")
             raise ValueError("YouTubeClient not initialized with credentials")
 
-        logger.info(f"Fetching videos for channel {channel_id} (limit: {limit}, order: {order})")
+        response = self.youtube.channels().list(part="contentDetails", id=channel_id).execute()
+        items = response.get("items")
+        if not items:
+            return None
+        return items[0]["contentDetails"]["relatedPlaylists"]["uploads"]
+
+    def iter_video_pages(
+        self,
+        channel_id: str,
+        limit: int = 50,
+        order: str = "date",
+        uploads_playlist_id: Optional[str] = None,
+    ) -> Iterator[list[dict]]:
+        """
+        Fetch recent videos from a YouTube channel one result page (up to 50) at a time,
+        so callers can start storing a page while the next one is fetched.
 
-        try:
-            # Step 1: Search for videos from the channel
-            search_response = self.youtube.search().list(
-                part="id,snippet",
-                channelId=channel_id,
-                maxResults=min(limit, 50),
-                order=order,
-                type="video"
-            ).execute()
+        Newest-first listings read the channel's uploads playlist (playlistItems.list,
+        1 quota unit per page); other orders need search.list (100 units per page).
 
-            if not search_response.get("items"):
-                logger.info(f"No videos found for channel {channel_id}")
-                return []
+        Args:
+            channel_id: YouTube channel ID
+            limit: Maximum number of videos to fetch across all pages
+            order: Sort order - 'date', 'viewCount', 'rating' (default: 'date')
+            uploads_playlist_id: Channel's uploads playlist, looked up if not given
 
-            # Extract video IDs
-            video_ids = [item["id"]["videoId"] for item in search_response["items"]]
-            logger.debug(f"Found {len(video_ids)} video IDs, fetching detailed metadata")
+        Yields:
+            Lists of video dictionaries with metadata
+        """
+        if not self.youtube:
+            logger.error("Attempted to fetch videos without credentials")
+            raise ValueError("YouTubeClient not initialized with credentials")
 
-            # Step 2: Get detailed video statistics
-            videos_response = self.youtube.videos().list(
-                part="snippet,contentDetails,statistics",
-                id=",".join(video_ids)
-            ).execute()
+        logger.info(f"Fetching videos for channel {channel_id} (limit: {limit}, order: {order})")
 
-            videos = []
-            for video in videos_response.get("items", []):
-                video_id = video["id"]
-                snippet = video["snippet"]
-                stats = video.get("statistics", {})
-                content_details = video.get("contentDetails", {})
-
-                # Parse ISO 8601 duration
-                duration_iso = content_details.get("duration", "PT0S")
-                duration_seconds = int(isodate.parse_duration(duration_iso).total_seconds())
-
-                # Parse published date
-                published_at = snippet.get("publishedAt")
-                if published_at:
-                    published_at = datetime.fromisoformat(published_at.replace("Z", "+00:00"))
-
-                videos.append({
-                    "video_id": video_id,
-                    "title": snippet.get("title", ""),
-                    "description": snippet.get("description", ""),
-                    "thumbnail_url": snippet["thumbnails"]["medium"]["url"],
-                    "duration_seconds": duration_seconds,
-                    "published_at": published_at,
-                    "views": int(stats.get("viewCount", 0)),
-                    "likes": int(stats.get("likeCount", 0)),
-                    "comments": int(stats.get("commentCount", 0)),
-                })
-
-            total_views = sum(v["views"] for v in videos)
-            logger.info(
-                f"Fetched {len(videos)} videos for channel {channel_id} - "
-                f"Total views: {total_views:,}"
-            )
+        use_uploads = order == "date"
+        if use_uploads and not uploads_playlist_id:
+            uploads_playlist_id = self.get_uploads_playlist_id(channel_id)
+            if not uploads_playlist_id:
+                logger.info(f"No uploads playlist found for channel {channel_id}")
+                return
 
-            return videos
+        page_token = None
+        remaining = limit
+        try:
+            while remaining > 0:
+                # Step 1: List video IDs from the uploads playlist (or search)
+                if use_uploads:
+                    list_response = self.youtube.playlistItems().list(
+                        part="contentDetails",
+                        playlistId=uploads_playlist_id,
+                        maxResults=min(remaining, 50),
+                        pageToken=page_token,
+                    ).execute()
+                    video_ids = [item["contentDetails"]["videoId"] for item in list_response.get("items", [])]
+                else:
+                    list_response = self.youtube.search().list(
+                        part="id",
+                        channelId=channel_id,
+                        maxResults=min(remaining, 50),
+                        order=order,
+                        type="video",
+                        pageToken=page_token,
+                    ).execute()
+                    video_ids = [item["id"]["videoId"] for item in list_response.get("items", [])]
+
+                if not video_ids:
+                    logger.info(f"No more videos found for channel {channel_id}")
+                    return
+
+                logger.debug(f"Found {len(video_ids)} video IDs, fetching detailed metadata")
+
+                # Step 2: Get detailed video statistics
+                yield self._fetch_video_details(video_ids)
+
+                remaining -= len(video_ids)
+                page_token = list_response.get("nextPageToken")
+                if not page_token:
+                    return
         except Exception as e:
             logger.error(f"Error fetching videos for channel {channel_id}: {e}", exc_info=True)
             raise
 
+    def _fetch_video_details(self, video_ids: list[str]) -> list[dict]:
+        """Get metadata and statistics for up to 50 videos in one videos.list call"""
+        videos_response = self.youtube.videos().list(
+            part="snippet,contentDetails,statistics",
+            id=",".join(video_ids)
+        ).execute()
+
+        videos = []
+        for video in videos_response.get("items", []):
+            video_id = video["id"]
+            snippet = video["snippet"]
+            stats = video.get("statistics", {})
+            content_details = video.get("contentDetails", {})
+
+            # Parse ISO 8601 duration
+            duration_iso = content_details.get("duration", "PT0S")
+            duration_seconds = int(isodate.parse_duration(duration_iso).total_seconds())
+
+            # Parse published date
+            published_at = snippet.get("publishedAt")
+            if published_at:
+                published_at = datetime.fromisoformat(published_at.replace("Z", "+00:00"))
+
+            videos.append({
+                "video_id": video_id,
+                "title": snippet.get("title", ""),
+                "description": snippet.get("description", ""),
+                "thumbnail_url": snippet["thumbnails"]["medium"]["url"],
+                "duration_seconds": duration_seconds,
+                "published_at": published_at,
+                "views": int(stats.get("viewCount", 0)),
+                "likes": int(stats.get("likeCount", 0)),
+                "comments": int(stats.get("commentCount", 0)),
+            })
+        return videos
+
     def _extract_channel_id(self, channel_url_or_id: str) -> str:
         """Extract channel ID from URL or return as-is if already an ID"""
         # If it's already a channel ID (starts with UC), return it
@@ -1,4 +1,5 @@
 from celery import Celery
+from celery.signals import worker_process_init, worker_ready
 import os
 
 broker_url = os.getenv("REDIS_URL", "redis://redis:6379/0")
@@ -13,17 +14,67 @@ app.conf.update(
         "app.services.generation_worker.*": {"queue": "generation"},
         "app.services.insights_worker.*": {"queue": "insights"},
         "app.services.pipeline_worker.*": {"queue": "ingest"},  # Pipeline runs in ingest queue
+        "app.services.token_worker.*": {"queue": "ingest"},
     },
     task_serializer="json",
     accept_content=["json"],
     result_serializer="json",
     timezone="UTC",
     enable_utc=True,
+    # Long tasks (download/transcribe/LLM): ack after completion and don't let one
+    # worker reserve a backlog while others sit idle
+    task_acks_late=True,
+    worker_prefetch_multiplier=1,
+    # Keep the broker socket alive between bursts of publishes
+    broker_transport_options={"socket_keepalive": True},
     imports=[
         "app.services.pipeline_worker",
         "app.services.ingest_worker",
         "app.services.transcribe_worker",
+        "app.services.token_worker",
+        "app.services.insights_worker",
+        "app.services.embedding_worker",
+        "app.services.generation_worker",
     ],
+    beat_schedule={
+        "refresh-channel-insights": {
+            "task": "app.services.insights_worker.refresh_channel_insights",
+            "schedule": 3600.0,
+        },
+    },
 )
 
 
+@worker_process_init.connect
+def warm_worker_singletons(**kwargs):
+    """
+    Build the LLM provider and Chroma collection once per worker process, so
+    the first task a child runs doesn't pay for it.
+
+    A backend that is down only logs a warning - the getters retry on first use.
+    """
+    # Local imports - the task modules import this one
+    from app.core.logging_config import get_logger
+    from app.services.llm_provider import get_llm_provider
+    from app.services.vector_store import get_vector_store
+
+    for getter in (get_llm_provider, get_vector_store):
+        try:
+            getter()
+        except Exception as e:
+            get_logger(__name__).warning(f"Could not warm {getter.__name__}: {e}")
+
+
+@worker_ready.connect
+def warm_pool_singletons(sender=None, **kwargs):
+    """
+    Warm the singletons for pools that run tasks in the main process.
+
+    Thread, solo and green pools never fork, so worker_process_init doesn't
+    fire for them. Prefork children already warmed themselves.
+    """
+    from celery.concurrency.prefork import TaskPool as PreforkPool
+
+    if isinstance(getattr(sender, "pool", None), PreforkPool):
+        return
+    warm_worker_singletons()
@@ -43,6 +43,38 @@ export interface GeneratedScript {
   context_used: number;
 }
 
+interface TaskStatus<T> {
+  task_id: string;
+  state: string;
+  result?: T | string;
+}
+
+const TASK_POLL_INTERVAL_MS = 1500;
+const TASK_POLL_TIMEOUT_MS = 5 * 60 * 1000;
+
+// Poll a queued backend task until it finishes, returning its result
+async function waitForTask<T>(taskId: string): Promise<T> {
+  const deadline = Date.now() + TASK_POLL_TIMEOUT_MS;
+  while (Date.now() < deadline) {
+    const res = await fetch(`${API_URL}/api/tasks/${taskId}`, { credentials: 'include' });
+    if (!res.ok) {
+      const error = await res.json();
+      throw new Error(error.detail || 'Failed to check task status');
+    }
+
+    const task: TaskStatus<T> = await res.json();
+    if (task.state === 'SUCCESS') {
+      return task.result as T;
+    }
+    if (task.state === 'FAILURE' || task.state === 'REVOKED') {
+      throw new Error(typeof task.result === 'string' ? task.result : 'Task failed');
+    }
+
+    await new Promise(resolve => setTimeout(resolve, TASK_POLL_INTERVAL_MS));
+  }
+  throw new Error('Timed out waiting for task to finish');
+}
+
 export interface TitleSuggestion {
   title: string;
   score: number;
@@ -92,7 +124,13 @@ export async function generateScript(
     throw new Error(error.detail || 'Failed to generate script');
   }
 
-  return await res.json();
+  // The script is generated on a worker - poll until it is ready
+  const { task_id } = await res.json();
+  const result = await waitForTask<GeneratedScript & { error?: string }>(task_id);
+  if (result.status === 'error') {
+    throw new Error(result.error || 'Failed to generate script');
+  }
+  return result;
 }
 
 export async function generateTitles(